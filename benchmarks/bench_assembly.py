@@ -0,0 +1,66 @@
+"""
+Benchmark: tidy-frame assembly in `getTableData`.
+
+Compares the original per-datapoint loop (one dict per row, one small DataFrame
+per vector, `pd.concat` inside the loop) with the single-pass columnar assembly
+now used by `statcan_wds._core._assemble_frame`, on synthetic WDS payloads.
+
+Usage:
+    python benchmarks/bench_assembly.py
+    python benchmarks/bench_assembly.py --vectors 10 100 1000 10000 --points 120
+"""
+
+import argparse
+
+import pandas as pd
+
+from common import make_labels, make_series, timeit
+from statcan_wds._core import LabelTable, _assemble_frame
+
+
+LABELS = {
+    "Geography": lambda v: f"Geo {v % 13}",
+    "Products and product groups": lambda v: f"Product {v}",
+}
+LABEL_COLS = list(LABELS)
+
+
+def legacy_assemble(series, labels, label_cols):
+    """The original assembly loop from getTableData, kept for comparison."""
+    final_df = None
+    for vId, dataPoints in series.items():
+        row_index = {k: labels[vId][k] for k in label_cols}
+        rows = []
+        for pt in dataPoints:
+            row = row_index | {"REF_DATE": pt["refPer"], "VALUE": pt["value"]}
+            rows.append(row)
+        df = pd.DataFrame(rows)
+        final_df = pd.concat([final_df, df], ignore_index=True)
+    return final_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--points", type=int, default=120, help="Datapoints per vector.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-max", type=int, default=10000,
+        help="Skip the legacy loop above this many vectors (it is quadratic).",
+    )
+    args = parser.parse_args()
+
+    print(f"{'vectors':>8} {'rows':>10} {'legacy (s)':>11} {'columnar (s)':>13} {'speedup':>8}")
+    for n in args.vectors:
+        series = make_series(n, args.points)
+        labels = make_labels(series, LABELS)
+        new, _ = timeit(_assemble_frame, series, LabelTable.from_dict(labels, LABEL_COLS), repeat=args.repeat)
+        if n <= args.legacy_max:
+            old, _ = timeit(legacy_assemble, series, labels, LABEL_COLS, repeat=1 if n >= 1000 else args.repeat)
+            print(f"{n:>8} {n * args.points:>10} {old:>11.3f} {new:>13.3f} {old / new:>7.1f}x")
+        else:
+            print(f"{n:>8} {n * args.points:>10} {'-':>11} {new:>13.3f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: building coordinate strings for a large compact spec.
+
+Compares the dict-per-combination path (`expand_specs` + `CubeSchema.coordinates`,
+what `buildCoordinates` does) with the vectorized rendering behind
+`CubeSchema.coordinate_strings` / `iter_coordinates`, and times the integer form
+(`CubeSchema.coordinate_matrix`) and its rendering (`renderCoordinates`), on a
+synthetic four-dimension cube.
+
+Usage:
+    python benchmarks/bench_coordinates.py
+    python benchmarks/bench_coordinates.py --sizes 100 1000 3000
+"""
+
+import argparse
+
+from common import timeit
+from statcan_wds._core import CubeSchema, expand_specs, renderCoordinates
+
+
+def make_schema(n_members):
+    """Cube with a large product dimension, a geography, and two small dimensions."""
+    dims = (("Geography", 1, 40), ("Type", 2, 3), ("Products", 4, n_members), ("UOM", 3, 2))
+    meta = {"dimension": [
+        {
+            "dimensionNameEn": name,
+            "dimensionPositionId": position,
+            "member": [{"memberNameEn": f"{name} {i}", "memberId": i} for i in range(1, k + 1)],
+        }
+        for name, position, k in dims
+    ]}
+    spec = [
+        {"Products": [f"Products {i}" for i in range(1, n_members + 1)]},
+        {"Geography": [f"Geography {i}" for i in range(1, 41)]},
+        {"Type": "Type 2"},
+        {"UOM": ["UOM 1", "UOM 2"]},
+    ]
+    return CubeSchema(1, meta), spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 6000],
+                        help="Members selected in the product dimension.")
+    args = parser.parse_args()
+
+    print(f"{'coords':>9} {'dict loop (s)':>14} {'vectorized (s)':>15} {'speedup':>8} "
+          f"{'int matrix (s)':>15} {'render (s)':>11}")
+    for n in args.sizes:
+        schema, spec = make_schema(n)
+        old, expected = timeit(lambda s: schema.coordinates(expand_specs(s)), spec)
+        new, coords = timeit(schema.coordinate_strings, spec)
+        matrix_time, matrix = timeit(schema.coordinate_matrix, spec)
+        render_time, rendered = timeit(renderCoordinates, matrix)
+        assert coords == expected == rendered
+        print(f"{len(coords):>9} {old:>14.3f} {new:>15.3f} {old / new:>7.1f}x "
+              f"{matrix_time:>15.3f} {render_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
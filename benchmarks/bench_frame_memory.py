@@ -0,0 +1,68 @@
+"""
+Benchmark: memory footprint of the `getTableData` frame.
+
+Compares the untyped layout `getTableData` used to return (dimension labels as
+repeated Python strings, REF_DATE as strings) with the typed layout built by
+`statcan_wds._core._assemble_frame` (Categorical labels, datetime64 REF_DATE,
+float64 VALUE), on a large synthetic spec. Sizes are `memory_usage(deep=True)`.
+
+Usage:
+    python benchmarks/bench_frame_memory.py
+    python benchmarks/bench_frame_memory.py --vectors 1000 5000 --points 300
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import make_labels, make_series, timeit
+from statcan_wds._core import LabelTable, _assemble_frame
+
+
+# CPI-like labels
+LABELS = {
+    "Geography": lambda v: f"Census metropolitan area {v % 35}, Province {v % 13}",
+    "Products and product groups": lambda v: f"Food purchased from stores, product group {v}",
+    "UOM": lambda v: "2002=100",
+}
+LABEL_COLS = list(LABELS)
+
+
+def untyped_frame(series, labels, label_cols):
+    """The previous output layout: object label columns and string REF_DATE."""
+    vector_ids = list(series)
+    counts = [len(series[v]) for v in vector_ids]
+    row_vector = np.repeat(np.arange(len(vector_ids)), counts)
+    columns = {}
+    for col in label_cols:
+        # Labels are copied per vector, as when they came from splitting series titles
+        per_vector = np.array([str(labels[v][col]).strip() for v in vector_ids], dtype=object)
+        columns[col] = per_vector.take(row_vector)
+    columns["REF_DATE"] = np.array([pt["refPer"] for v in vector_ids for pt in series[v]], dtype=object)
+    columns["VALUE"] = np.array([pt["value"] for v in vector_ids for pt in series[v]], dtype=object)
+    return pd.DataFrame(columns).infer_objects()
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--points", type=int, default=300, help="Datapoints per vector.")
+    args = parser.parse_args()
+
+    print(f"{'vectors':>8} {'rows':>10} {'untyped (MB)':>13} {'typed (MB)':>11} {'ratio':>6} {'typed build (s)':>16}")
+    for n in args.vectors:
+        series = make_series(n, args.points)
+        labels = make_labels(series, LABELS)
+        before = megabytes(untyped_frame(series, labels, LABEL_COLS))
+        elapsed, typed = timeit(_assemble_frame, series, LabelTable.from_dict(labels, LABEL_COLS))
+        after = megabytes(typed)
+        print(f"{n:>8} {len(typed):>10} {before:>13.1f} {after:>11.1f} {before / after:>5.1f}x {elapsed:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: decoding and extracting a WDS `vectorDataPoint` payload.
+
+Compares the original path (stdlib `json` decode, then a Python loop over the
+points pulling `refPer` / `value`) with the decoder layer in `statcan_wds._json`
+(orjson when installed, `itemgetter` extraction), on a multi-megabyte payload
+shaped like a `getDataFromVectorByReferencePeriodRange` response.
+
+It also compares peak memory of decoding a streamed body buffered (joined, then
+decoded) against incremental decoding with ijson, when ijson is installed.
+
+Pass `--payload FILE` to time a recorded response body instead of the synthetic one
+(`--save FILE` writes the synthetic payload out for reuse).
+
+Usage:
+    python benchmarks/bench_json.py
+    python benchmarks/bench_json.py --vectors 50 --points 300
+    python benchmarks/bench_json.py --payload recorded_response.json
+"""
+
+import argparse
+import json
+
+from common import make_body, peak_memory, timeit
+from statcan_wds._json import CHUNK_SIZE, JSON_BACKEND, ijson, loads, point_columns, read_json
+
+
+def legacy_extract(body):
+    """`response.json()` + the per-point loop the client used to run."""
+    ref_dates, values = [], []
+    for item in json.loads(body):
+        for pt in item["object"]["vectorDataPoint"]:
+            ref_dates.append(pt["refPer"])
+            values.append(pt["value"])
+    return ref_dates, values
+
+
+def fast_extract(body):
+    """Pluggable decoder + `point_columns`."""
+    ref_dates, values = [], []
+    for item in loads(body):
+        refs, vals = point_columns(item["object"]["vectorDataPoint"])
+        ref_dates.extend(refs)
+        values.extend(vals)
+    return ref_dates, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, default=100)
+    parser.add_argument("--points", type=int, default=300, help="Datapoints per vector.")
+    parser.add_argument("--payload", help="Recorded response body to decode instead.")
+    parser.add_argument("--save", help="Write the synthetic payload to this file.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            body = f.read()
+    else:
+        body = make_body(args.vectors, args.points)
+        if args.save:
+            with open(args.save, "wb") as f:
+                f.write(body)
+
+    assert legacy_extract(body) == fast_extract(body)
+    n_points = len(legacy_extract(body)[0])
+    old, _ = timeit(legacy_extract, body, repeat=args.repeat)
+    new, _ = timeit(fast_extract, body, repeat=args.repeat)
+    print(f"payload: {len(body) / 1e6:.1f} MB, {n_points} datapoints, decoder: {JSON_BACKEND}")
+    print(f"{'json + loop (s)':>16} {JSON_BACKEND + ' + itemgetter (s)':>24} {'speedup':>8}")
+    print(f"{old:>16.3f} {new:>24.3f} {old / new:>7.1f}x")
+
+    if ijson is not None:
+        chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+        print(f"\nstreamed body in {CHUNK_SIZE // 1024} KiB chunks ({len(chunks)} chunks)")
+        print(f"{'decoding':>12} {'time (s)':>9} {'peak (MB)':>10}")
+        for name, incremental in (("buffered", False), ("incremental", True)):
+            elapsed, peak = peak_memory(read_json, iter(chunks), None, incremental)
+            print(f"{name:>12} {elapsed:>9.3f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Synthetic WDS data and timing helpers shared by the benchmark scripts.
+
+- `make_series`: {vectorId: [datapoint]} as the clients decode it, optionally with
+  every attribute WDS sends.
+- `make_labels`: {vectorId: {column: label}} for such series.
+- `make_body`: a `getDataFromVectorByReferencePeriodRange` response body (bytes).
+- `timeit` / `peak_memory`: best wall time, and peak traced memory, of a call.
+"""
+
+import json
+import time
+import tracemalloc
+
+
+def month_dates(n_points):
+    """`n_points` monthly reference periods from 2000-01-01, as WDS `refPer` strings."""
+    return [f"{2000 + m // 12}-{m % 12 + 1:02d}-01" for m in range(n_points)]
+
+
+def make_series(n_vectors, n_points, full=False):
+    """
+    Synthetic {vectorId: [datapoint]} with `n_points` monthly points per vector.
+
+    `full=True` gives each point every field WDS sends, not just refPer / value.
+    """
+    dates = month_dates(n_points)
+    series = {}
+    for v in range(1, n_vectors + 1):
+        if full:
+            coordinate = f"{v % 13 + 1}.{v}.0.0.0.0.0.0.0.0"
+            series[v] = [
+                {
+                    "vectorId": v, "coordinate": coordinate, "refPer": d, "refPer2": "",
+                    "refPerRaw": d, "refPerRaw2": "", "value": float(v % 97 + i), "decimals": 1,
+                    "scalarFactorCode": 0, "symbolCode": 0, "statusCode": 0, "securityLevelCode": 0,
+                    "releaseTime": "2025-06-17T08:30", "frequencyCode": 6,
+                }
+                for i, d in enumerate(dates)
+            ]
+        else:
+            series[v] = [{"refPer": d, "value": float(v % 97 + i)} for i, d in enumerate(dates)]
+    return series
+
+
+def make_labels(series, columns):
+    """{vectorId: {column: label}} for `series`; `columns` maps each column to a vectorId -> label function."""
+    return {v: {col: label(v) for col, label in columns.items()} for v in series}
+
+
+def make_body(n_vectors, n_points):
+    """Response body (bytes) of a data request for `make_series(..., full=True)`."""
+    items = [
+        {
+            "status": "SUCCESS",
+            "object": {
+                "responseStatusCode": 0,
+                "productId": 18100004,
+                "coordinate": points[0]["coordinate"],
+                "vectorId": v,
+                "vectorDataPoint": points,
+            },
+        }
+        for v, points in make_series(n_vectors, n_points, full=True).items()
+    ]
+    return json.dumps(items).encode()
+
+
+def timeit(fn, *args, repeat=1):
+    """(best wall time of `repeat` runs in seconds, result of the last run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(fn, *args):
+    """(seconds, peak traced MB) of one call."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / 1e6
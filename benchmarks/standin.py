@@ -0,0 +1,358 @@
+"""
+Record/replay stand-in for the StatCan WDS and Bank of Canada Valet services.
+
+Exercising `statcan_wds` or `ingestion/wds_data.py` normally means talking to the
+live services, which makes timings noisy and is impossible on air-gapped hosts.
+This module is one small HTTP server (standard library only) with two modes:
+
+- `record`: a pass-through proxy. `GET/POST /<host>/<path>` is forwarded to
+  `https://<host>/<path>` and every exchange is saved as a fixture.
+- `serve`: replays the fixtures, with optional latency (+ jitter), a bandwidth
+  cap and error injection (e.g. 503 / 429 with `Retry-After`), to exercise the
+  client's pooling, throttling and retry paths reproducibly.
+
+Clients are pointed at the server through their base URLs, which both packages
+read from the environment:
+
+    STATCAN_WDS_BASE_URL=http://127.0.0.1:8765/www150.statcan.gc.ca/t1/wds/rest
+    VALET_BASE_URL=http://127.0.0.1:8765/www.bankofcanada.ca/valet
+
+(`StandIn.environ()` returns them; the `env` command prints them as exports).
+Absolute URLs to the proxied hosts inside response bodies, such as the zip
+location returned by `getFullTableDownloadCSV`, are rewritten to go through the
+server as well, so bulk downloads are recorded and replayed too.
+
+Fixtures live in one directory, two files per exchange: `<key>.json` (method,
+path, status, content type) and `<key>.body` (the decoded body). The key hashes
+the method, the path with its query string and, for POSTs, the JSON payload in
+canonical form.
+
+Usage:
+    # 1) Record an ingest run against the live services
+    python benchmarks/standin.py record fixtures/ --port 8765 &
+    eval "$(python benchmarks/standin.py env --port 8765)"
+    python ingestion/ingest.py
+
+    # 2) Replay it offline: 50 ms latency, 2 MB/s, 5% of requests answered 503
+    python benchmarks/standin.py serve fixtures/ --port 8765 --latency 0.05 --bandwidth 2e6 --error-rate 0.05
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+WDS_HOST = "www150.statcan.gc.ca"
+WDS_PATH = "/t1/wds/rest"
+VALET_HOST = "www.bankofcanada.ca"
+VALET_PATH = "/valet"
+
+# Bodies smaller than this are sent uncompressed, like the live services do
+_GZIP_MIN_SIZE = 1024
+
+
+def environ(url):
+    """Environment variables pointing `statcan_wds` and the ingest Valet calls at a server at `url`."""
+    return {
+        "STATCAN_WDS_BASE_URL": f"{url}/{WDS_HOST}{WDS_PATH}",
+        "VALET_BASE_URL": f"{url}/{VALET_HOST}{VALET_PATH}",
+    }
+
+
+def fixture_key(method, path, payload=b""):
+    """Fixture name of one exchange: hash of method, path (with query) and canonical JSON payload."""
+    if payload:
+        try:
+            payload = json.dumps(json.loads(payload), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass  # not JSON: key on the raw bytes
+    return hashlib.sha1(f"{method} {path}\n".encode() + payload).hexdigest()
+
+
+class FixtureStore:
+    """Directory of recorded exchanges (see the module docstring for the layout)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key):
+        """Return (meta, body) for `key`, or None if it was never recorded."""
+        try:
+            meta = json.loads((self.root / f"{key}.json").read_text(encoding="utf-8"))
+            body = (self.root / f"{key}.body").read_bytes()
+        except OSError:
+            return None
+        return meta, body
+
+    def save(self, key, meta, body):
+        # The body goes first, so a fixture with metadata is always complete
+        (self.root / f"{key}.body").write_bytes(body)
+        (self.root / f"{key}.json").write_text(json.dumps(meta, indent=1), encoding="utf-8")
+
+    def __len__(self):
+        return sum(1 for _ in self.root.glob("*.json"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the pooled clients expect
+
+    def do_GET(self):
+        self.server.standin.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.standin.handle(self, "POST")
+
+    def log_message(self, format, *args):
+        if self.server.standin.verbose:
+            super().log_message(format, *args)
+
+
+class StandIn:
+    """
+    Local WDS / Valet stand-in server.
+
+    Parameters
+    ----------
+    fixtures : str or Path
+        Fixture directory (created if missing).
+    mode : {"serve", "record"}
+        Replay fixtures, or proxy to the live services and record them.
+    host, port : str, int
+        Address to listen on; port 0 picks a free port.
+    latency : float
+        Seconds added before every response.
+    jitter : float
+        Extra uniform random delay in [0, jitter) seconds per response.
+    bandwidth : float or None
+        Cap on the bytes per second written per response (None: unlimited).
+    error_rate : float
+        Fraction of requests answered with `error_status` instead of the fixture.
+    error_status : int
+        HTTP status of injected errors (503 and 429 are retried by the clients).
+    retry_after : float or None
+        `Retry-After` seconds sent with injected errors.
+    upstream_scheme : str
+        Scheme used to reach `/<host>/...` in record mode.
+    rewrite_hosts : tuple[str]
+        Hosts whose absolute URLs in response bodies are routed through the server.
+    seed : int or None
+        Seed for jitter and error injection, for reproducible runs.
+    verbose : bool
+        Log every request to stderr.
+
+    Attributes
+    ----------
+    stats : dict
+        Counters: "served", "recorded", "missing" (no fixture: answered 404)
+        and "injected" (errors injected).
+    """
+
+    def __init__(self, fixtures, mode="serve", host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 bandwidth=None, error_rate=0.0, error_status=503, retry_after=None, upstream_scheme="https",
+                 rewrite_hosts=(WDS_HOST, VALET_HOST), seed=None, verbose=False):
+        if mode not in ("serve", "record"):
+            raise ValueError(f"Expected mode 'serve' or 'record' but received: '{mode}'")
+        self.store = FixtureStore(fixtures)
+        self.mode = mode
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.upstream_scheme = upstream_scheme
+        self.rewrite_hosts = tuple(rewrite_hosts)
+        self.verbose = verbose
+        self.stats = {"served": 0, "recorded": 0, "missing": 0, "injected": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def environ(self):
+        """Base-URL environment variables for this server (see the module `environ`)."""
+        return environ(self.url)
+
+    def _bind(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        """Start serving on a background thread; returns the server's root URL."""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def handle(self, request, method):
+        length = int(request.headers.get("Content-Length") or 0)
+        payload = request.rfile.read(length) if length else b""
+        key = fixture_key(method, request.path, payload)
+
+        with self._lock:
+            inject = self.mode == "serve" and self._random.random() < self.error_rate
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if inject:
+            self._count("injected")
+            headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            body = json.dumps({"error": "injected by stand-in"}).encode()
+            return self._send(request, self.error_status, "application/json", body, headers)
+
+        if self.mode == "record":
+            meta, body = self._forward(method, request.path, payload, request.headers)
+            self.store.save(key, meta, body)
+            self._count("recorded")
+        else:
+            entry = self.store.load(key)
+            if entry is None:
+                self._count("missing")
+                body = json.dumps({"error": f"no fixture for {method} {request.path}"}).encode()
+                return self._send(request, 404, "application/json", body)
+            meta, body = entry
+            self._count("served")
+        self._send(request, meta["status"], meta["content_type"], self._rewrite(body, meta["content_type"]))
+
+    def _forward(self, method, path, payload, headers):
+        """Send one request upstream; returns (meta, decoded body), HTTP errors included."""
+        host, _, rest = path.lstrip("/").partition("/")
+        upstream = urllib.request.Request(
+            f"{self.upstream_scheme}://{host}/{rest}", data=payload or None, method=method,
+            headers={
+                "Content-Type": headers.get("Content-Type", "application/json"),
+                "Accept-Encoding": "identity",
+                "User-Agent": headers.get("User-Agent", "statcan-wds-standin"),
+            },
+        )
+        try:
+            with urllib.request.urlopen(upstream, timeout=300) as response:
+                status, content_type, body = response.status, response.headers.get("Content-Type"), response.read()
+        except urllib.error.HTTPError as e:
+            status, content_type, body = e.code, e.headers.get("Content-Type"), e.read()
+        meta = {"method": method, "path": path, "status": status,
+                "content_type": content_type or "application/octet-stream"}
+        return meta, body
+
+    def _rewrite(self, body, content_type):
+        """Route absolute URLs to the proxied hosts in text bodies through this server."""
+        if not any(t in content_type for t in ("json", "text", "csv", "xml")):
+            return body
+        for host in self.rewrite_hosts:
+            body = body.replace(f"{self.upstream_scheme}://{host}/".encode(), f"{self.url}/{host}/".encode())
+        return body
+
+    def _send(self, request, status, content_type, body, headers=None):
+        encoding = None
+        if len(body) >= _GZIP_MIN_SIZE and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body, encoding = gzip.compress(body, compresslevel=6), "gzip"
+
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(body)))
+        if encoding:
+            request.send_header("Content-Encoding", encoding)
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+
+        if not self.bandwidth:
+            request.wfile.write(body)
+            return
+        # Throttled write: ~20 slices per second at the configured rate
+        step = max(1024, int(self.bandwidth / 20))
+        for i in range(0, len(body), step):
+            part = body[i:i + step]
+            request.wfile.write(part)
+            time.sleep(len(part) / self.bandwidth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("record", "serve"):
+        p = sub.add_parser(command, help=f"{command} fixtures")
+        p.add_argument("fixtures", help="Fixture directory.")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--verbose", action="store_true")
+        if command == "serve":
+            p.add_argument("--latency", type=float, default=0.0, help="Seconds before every response.")
+            p.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, up to this many seconds.")
+            p.add_argument("--bandwidth", type=float, default=None, help="Bytes per second per response.")
+            p.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed.")
+            p.add_argument("--error-status", type=int, default=503)
+            p.add_argument("--retry-after", type=float, default=None)
+            p.add_argument("--seed", type=int, default=None)
+        else:
+            p.add_argument("--upstream-scheme", default="https")
+
+    p = sub.add_parser("env", help="print the base-URL exports for a running server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "env":
+        for name, value in environ(f"http://{args.host}:{args.port}").items():
+            print(f"export {name}={value}")
+        return
+
+    options = {k: v for k, v in vars(args).items() if k not in ("command", "fixtures")}
+    standin = StandIn(args.fixtures, mode=args.command, **options)
+    print(f"{args.command}: {args.fixtures} ({len(standin.store)} fixtures) on {standin.url}")
+    for name, value in standin.environ().items():
+        print(f"  {name}={value}")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(standin.stats)
+
+
+if __name__ == "__main__":
+    main()
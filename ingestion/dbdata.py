@@ -33,7 +33,21 @@ def make_on_conflict_do_nothing(conflict_cols):
     return _method
 
 
-def load_data(engine, df, table_name, if_exists="append"):
+def make_on_conflict_do_update(conflict_cols):
+    def _method(sqltable, conn, keys, data_iter):
+        rows = [dict(zip(keys, row)) for row in data_iter]
+        if not rows:
+            return
+        stmt = pg_insert(sqltable.table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_={k: stmt.excluded[k] for k in keys if k not in conflict_cols}
+        )
+        conn.execute(stmt)
+    return _method
+
+
+def load_data(engine, df, table_name, if_exists="append", on_conflict="nothing"):
     try:
         # Normalize 'date' to python date objects
         if "date" in df.columns:
@@ -49,12 +63,15 @@ def load_data(engine, df, table_name, if_exists="append"):
 
         logger.info(f"Inserting {len(df)} rows into {table_name}")
 
+        # "update" overwrites existing rows so StatCan revisions replace old values
+        make_method = make_on_conflict_do_update if on_conflict == "update" else make_on_conflict_do_nothing
+
         df.to_sql(
             name=table_name, 
             con=engine,
             if_exists=if_exists, 
             index=False,
-            method=make_on_conflict_do_nothing(conflict_cols) if conflict_cols else None
+            method=make_method(conflict_cols) if conflict_cols else None
         )
         logger.info("Successfully loaded data")
     except Exception as e:
@@ -1,69 +1,176 @@
-from statcan_wds import previewDimensions, getTableData
+from statcan_wds import previewDimensions, getTableData, getChangedCubeList, Event, Metrics, instrument
 from wds_data import (
     get_fx_data, 
     get_labour_force_data, 
     get_fuel_price_data, 
-    get_trade_data, get_cpi_data
+    get_trade_data, get_cpi_data,
+    get_changed_start,
+    LFS_PID, FUEL_PRICE_PID, TRADE_PID, TRADE_ARCHIVED_PID, CPI_PID
 )
 from dbdata import connect, create_tables, load_data
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import pandas as pd
 
 import config
 import logging
 import argparse
+import json
+import os
+import time
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
         
 
-def load_fx_data(engine, startDate, endDate, if_exists="replace"):
+def load_fx_data(engine, startDate, endDate, if_exists="replace", on_conflict="nothing"):
     logger.info("Fetching Foreign Exchange data from Bank of Canada")
     fx_data = get_fx_data(codes=config.FX_CODES, startDate=startDate, endDate=endDate)
-    load_data(engine, fx_data, table_name="foreign_exchange")
+    load_data(engine, fx_data, table_name="foreign_exchange", on_conflict=on_conflict)
 
 
-def load_labour_data(engine, startDate, endDate, if_exists="replace"):
+def load_labour_data(engine, startDate, endDate, if_exists="replace", on_conflict="nothing"):
     logger.info("Fetching Labour Force Status data from StatCan")
     lfs_data = get_labour_force_data(specs=config.LFS_SPECS, startDate=startDate, endDate=endDate)
-    load_data(engine, lfs_data, table_name="labour_force_status")
+    load_data(engine, lfs_data, table_name="labour_force_status", on_conflict=on_conflict)
 
 
-def load_fuel_data(engine, startDate, endDate, if_exists="replace"):
+def load_fuel_data(engine, startDate, endDate, if_exists="replace", on_conflict="nothing"):
     logger.info("Fetching fuel price data from StatCan")
     fuel_price_data = get_fuel_price_data(specs=config.FUEL_PRICE_SPECS, startDate=startDate, endDate=endDate)
-    load_data(engine, fuel_price_data, table_name="fuel_price")
+    load_data(engine, fuel_price_data, table_name="fuel_price", on_conflict=on_conflict)
     
 
-def load_trade_data(engine, startDate, endDate, if_exists="replace"):
+def load_trade_data(engine, startDate, endDate, if_exists="replace", on_conflict="nothing"):
     logger.info("Fetching trade data from StatCan")
     trade_data = get_trade_data(specs=config.TRADE_SPECS, startDate=startDate, endDate=endDate)
-    load_data(engine, trade_data, table_name="trade_index")
+    load_data(engine, trade_data, table_name="trade_index", on_conflict=on_conflict)
 
 
-def load_cpi_data(engine, startDate, endDate, if_exists="replace"):
+def load_cpi_data(engine, startDate, endDate, if_exists="replace", on_conflict="nothing"):
     logger.info("Fetching food CPI data from StatCan")
     food_cpi_data = get_cpi_data(specs=config.CPI_SPECS, startDate=startDate, endDate=endDate)
-    load_data(engine, food_cpi_data, table_name="food_cpi")
+    load_data(engine, food_cpi_data, table_name="food_cpi", on_conflict=on_conflict)
 
 
-def ingest_data(mode="update", ddl_path="schema.sql", startDate="2000-01-01", endDate="2025-12-31"):
+# StatCan sources: table name -> (loader, [(pid, specs), ...]) used for delta checks
+STATCAN_SOURCES = {
+    "labour_force_status": (load_labour_data, [(LFS_PID, config.LFS_SPECS)]),
+    "fuel_price": (load_fuel_data, [(FUEL_PRICE_PID, config.FUEL_PRICE_SPECS)]),
+    "trade_index": (load_trade_data, [(TRADE_ARCHIVED_PID, config.TRADE_SPECS), (TRADE_PID, config.TRADE_SPECS)]),
+    "food_cpi": (load_cpi_data, [(CPI_PID, config.CPI_SPECS)]),
+}
+
+
+def load_state(state_path):
+    """Read {source: {"since", "start", "end"}} from the state file (empty if missing)."""
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_path, state):
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def to_day(d):
+    """Normalize a date to YYYY-MM-DD, so ranges compare as strings."""
+    return str(pd.to_datetime(d).date())
+
+
+def loaded_range(entry):
+    """(start, end) of reference periods a state entry vouches for; None if unknown."""
+    # Entries written before ranges were stored are a bare watermark
+    if isinstance(entry, dict):
+        return entry["start"], entry["end"]
+    return None
+
+
+@contextmanager
+def track(metrics, source):
+    """Collect the statcan_wds events and total time of one source into metrics[source]."""
+    source_metrics = metrics.setdefault(source, Metrics())
+    started = time.perf_counter()
+    try:
+        with instrument(source_metrics):
+            yield source_metrics
+    finally:
+        source_metrics(Event("phase", "total", seconds=time.perf_counter() - started))
+
+
+def format_metrics(source, summary):
+    """One log line: time per phase, requests and bytes, cache hits / lookups."""
+    phases = ", ".join(f"{name} {p['seconds']:.2f}s" for name, p in summary["phases"].items())
+    requests = summary["requests"]
+    caches = ", ".join(f"{name} {c['hits']}/{c['hits'] + c['misses']}" for name, c in summary["caches"].items())
+    return (f"{source}: {phases}; {requests['count']} requests ({requests['throttled']} throttled), "
+            f"{requests['wire_bytes'] / 1e6:.1f} MB received; cache hits {caches or 'n/a'}")
+
+
+def ingest_data(mode="update", ddl_path="schema.sql", startDate="2000-01-01", endDate="2025-12-31",
+                state_path="ingest_state.json", metrics_path=None):
     if mode != "create" and mode != "update":
         raise ValueError(f"Expected 'create' or 'update' but received: '{mode}'")
     
     engine = connect()
+    # Watermark for this run: taken before fetching so releases published while
+    # we download are picked up next time.
+    run_started = datetime.now(timezone.utc).isoformat()
+    state = load_state(state_path) if mode == "update" else {}
+    on_conflict = "update" if mode == "update" else "nothing"
 
     if mode == "create":
         logger.info(f"Creating tables using {ddl_path}")
         create_tables(engine, ddl_path)
         logger.info("Tables created!")
     
-    load_fx_data(engine, startDate, endDate)
-    load_labour_data(engine, startDate, endDate)
-    load_fuel_data(engine, startDate, endDate)
-    load_trade_data(engine, startDate, endDate)
-    load_cpi_data(engine, startDate, endDate)
-
+    # Per-source timings, requests, bytes and cache hits
+    metrics = {}
+    with track(metrics, "foreign_exchange"):
+        load_fx_data(engine, startDate, endDate, on_conflict=on_conflict)
+
+    startDate, endDate = to_day(startDate), to_day(endDate)
+    if state:
+        # Today's changed-cube list may already be cached in-process (config.py's
+        # import-time previewDimensions calls fetch it). Refetch it so the delta
+        # checks below see every release up to run_started, the next watermark.
+        getChangedCubeList(run_started, refresh=True)
+    for source, (loader, tables) in STATCAN_SOURCES.items():
+        with track(metrics, source):
+            entry = state.get(source)
+            loaded = loaded_range(entry)
+            if loaded is not None and loaded[0] <= startDate and endDate <= loaded[1]:
+                # Delta refresh: the requested range is already loaded, so only refetch
+                # from the earliest period revised anywhere in the loaded range
+                (start, end), since = loaded, entry["since"]
+                changed = get_changed_start(tables, since, start, end)
+                if changed is None:
+                    logger.info(f"No StatCan changes for {source} since {since}; skipping")
+                    state[source] = dict(entry, since=run_started)
+                    continue
+                logger.info(f"{source} changed since {since}; refreshing from {changed}")
+                loader(engine, changed, end, on_conflict=on_conflict)
+            else:
+                start, end = startDate, endDate
+                if loaded is not None:
+                    # Backfill / extension: fetch the union in full, so the new
+                    # watermark holds for every period it covers
+                    start, end = min(start, loaded[0]), max(end, loaded[1])
+                    logger.info(f"{source} loaded for {loaded[0]}..{loaded[1]} only; fetching {start}..{end}")
+                loader(engine, start, end, on_conflict=on_conflict)
+        state[source] = {"since": run_started, "start": start, "end": end}
+        save_state(state_path, state)
+
+    save_state(state_path, state)
+    summaries = {source: m.summary() for source, m in metrics.items()}
+    for source, summary in summaries.items():
+        logger.info(format_metrics(source, summary))
+    if metrics_path is not None:
+        with open(metrics_path, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
     logger.info("Data ingestion completed successfully!")
 
 
@@ -99,6 +206,20 @@ if __name__ == "__main__":
         help="End date in YYYY-MM-DD format (default: 2025-12-31)."
     )
 
+    parser.add_argument(
+        "--state",
+        default="ingest_state.json",
+        dest="state_path",
+        help="JSON file holding per-source watermarks and loaded date ranges for delta updates (default: ingest_state.json)."
+    )
+
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        dest="metrics_path",
+        help="Write per-source timings, request counts, bytes and cache hits to this JSON file."
+    )
+
     args = parser.parse_args()
 
-    ingest_data(args.mode, args.ddl_path, args.startDate, args.endDate)
+    ingest_data(args.mode, args.ddl_path, args.startDate, args.endDate, args.state_path, args.metrics_path)
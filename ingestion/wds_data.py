@@ -1,11 +1,26 @@
-from statcan_wds import previewDimensions, getTableData
+from statcan_wds import previewDimensions, getTableData, getChangedTableData
 import pandas as pd
 import re
+import os
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# StatCan tables (productIds)
+LFS_PID = 14100287
+FUEL_PRICE_PID = 18100001
+TRADE_PID = 12100168
+TRADE_ARCHIVED_PID = 12100128
+CPI_PID = 18100006
+
+# Bank of Canada Valet API (VALET_BASE_URL overrides it, e.g. for a local stand-in server)
+VALET_URL = "https://www.bankofcanada.ca/valet"
+
+
+def valet_url():
+    return (os.getenv("VALET_BASE_URL") or VALET_URL).rstrip("/")
+
 
 def to_snake_case(string):
     return re.sub("\s+", "_", string.lower())
@@ -17,7 +32,8 @@ def pivot_column(df, index, col, value_col, aggfunc="first"):
             index=index,
             columns=col,
             values=value_col,
-            aggfunc=aggfunc
+            aggfunc=aggfunc,
+            observed=True  # dimension columns are Categorical; skip unused combinations
         )
         .reset_index()
         .rename_axis(None, axis=1)
@@ -54,7 +70,7 @@ def get_legacy_fx_data(codes, startDate="2000-01-01", endDate="2016-12-31", skip
     fx_df = None
     
     for code in codes:
-        fx_url = f"https://www.bankofcanada.ca/valet/observations/{code}/csv?start_date={startDate}&end_date={endDate}"
+        fx_url = f"{valet_url()}/observations/{code}/csv?start_date={startDate}&end_date={endDate}"
         
         try:
             df = pd.read_csv(fx_url, skiprows=skiprows)
@@ -81,7 +97,7 @@ def get_current_fx_data(codes, startDate="2017-01-01", endDate="2025-12-31", ski
 
     startDate = str(max(pd.to_datetime(startDate), pd.to_datetime("2017-01-01")).date())
     
-    fx_url = f"https://www.bankofcanada.ca/valet/observations/group/FX_RATES_MONTHLY/csv?start_date={startDate}"
+    fx_url = f"{valet_url()}/observations/group/FX_RATES_MONTHLY/csv?start_date={startDate}"
     
     try:
         df = pd.read_csv(fx_url, skiprows=skiprows)
@@ -105,25 +121,21 @@ def get_fx_data(codes, startDate, endDate):
 
 
 def get_labour_force_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
-    PID = 14100287
-    raw_df = getTableData(pid=PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate)
-    df = pivot_column(df=raw_df, index=["Geography", "REF_DATE"], col="Labour force characteristics", value_col="VALUE")
+    df = getTableData(pid=LFS_PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate,
+                      layout="wide", columns_from="Labour force characteristics", index_from="Geography")
     df = df.rename(columns={"REF_DATE": "date"})
-    df["date"] = pd.to_datetime(df["date"])
     df.columns = [to_snake_case(c) for c in df.columns]
     return df
 
 
 def get_fuel_price_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
-    PID = 18100001
-    raw_df = getTableData(pid=PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate)
-    df = pivot_column(df=raw_df, index=["Geography", "REF_DATE"], col="Type of fuel", value_col="VALUE")
+    df = getTableData(pid=FUEL_PRICE_PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate,
+                      layout="wide", columns_from="Type of fuel", index_from="Geography")
     df = df.rename(columns={
         "REF_DATE": "date", 
         "Regular unleaded gasoline at self service filling stations": "Gasoline price",
         "Diesel fuel at self service filling stations": "Diesel price"
     })
-    df["date"] = pd.to_datetime(df["date"])
     df = df.groupby(["date"], as_index=False).agg({"Gasoline price": "mean", "Diesel price": "mean"})
     df["Geography"] = "Canada"
     df.columns = [to_snake_case(c) for c in df.columns]
@@ -131,26 +143,22 @@ def get_fuel_price_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
 
 
 def get_trade_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
-    CURRENT_PID = 12100168
-    ARCHIVED_PID = 12100128
     # Helper function
     def fetch_data(specs, pid, startDate, endDate):
-        raw_df = getTableData(pid=pid, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate)
-        # build the target column header: "Trade <Index>"
-        raw_df["Trade"] = raw_df["Trade"].astype(str) + " " + raw_df["Index"].astype(str)
-        df = pivot_column(df=raw_df, index=["Geography", "REF_DATE"], col="Trade", value_col="VALUE")
+        # one column per "Trade <Index>" header
+        df = getTableData(pid=pid, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate,
+                          layout="wide", columns_from=["Trade", "Index"], index_from="Geography")
         df = df.rename(columns={"REF_DATE": "date"})
-        df["date"] = pd.to_datetime(df["date"])
         return df
 
     archived = None
     current = None
     if pd.to_datetime(startDate) < pd.to_datetime("2017-01-01"):
         date = str(min(pd.to_datetime(endDate),  pd.to_datetime("2016-12-31")).date())
-        archived = fetch_data(specs, pid=ARCHIVED_PID, startDate=startDate, endDate=date)
+        archived = fetch_data(specs, pid=TRADE_ARCHIVED_PID, startDate=startDate, endDate=date)
     if pd.to_datetime(endDate) >= pd.to_datetime("2017-01-01"):
         date = str(max(pd.to_datetime(startDate), pd.to_datetime("2017-01-01")).date())
-        current = fetch_data(specs, pid=CURRENT_PID, startDate=date, endDate=endDate)
+        current = fetch_data(specs, pid=TRADE_PID, startDate=date, endDate=endDate)
     
     trade_df = pd.concat([archived, current], ignore_index=True)
     trade_df.columns = [to_snake_case(c) for c in trade_df.columns]
@@ -158,11 +166,29 @@ def get_trade_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
 
 
 def get_cpi_data(specs, startDate="2000-01-01", endDate="2025-12-31"):
-    PID = 18100006
-    raw_df = getTableData(pid=PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate)
-    raw_df["Products and product groups"] = raw_df["Products and product groups"].astype(str) + " CPI"
-    df = pivot_column(df=raw_df, index=["Geography", "REF_DATE"], col="Products and product groups", value_col="VALUE")
+    df = getTableData(pid=CPI_PID, series_specs=specs, startRefPeriod=startDate, endRefPeriod=endDate,
+                      layout="wide", columns_from="Products and product groups", index_from="Geography")
+    df.columns = [c if c in ("Geography", "REF_DATE") else f"{c} CPI" for c in df.columns]
     df = df.rename(columns={"REF_DATE": "date"})
-    df["date"] = pd.to_datetime(df["date"])
     df.columns = [to_snake_case(c) for c in df.columns]
     return df
+
+
+def get_changed_start(sources, since, startDate="2000-01-01", endDate="2025-12-31"):
+    """
+    Earliest reference period revised or added since `since` across `sources`.
+
+    `sources` is a list of (pid, specs). The points come from everything StatCan
+    released since `since` (changed-series data after one release, the release
+    window after several), so revisions to old periods are caught too. Returns a
+    YYYY-MM-DD start date to refetch from, or None when none of the tables changed
+    within [startDate, endDate].
+    """
+    changed = [
+        getChangedTableData(pid=pid, series_specs=specs, since=since, startRefPeriod=startDate, endRefPeriod=endDate)
+        for pid, specs in sources
+    ]
+    ref_dates = pd.concat([df["REF_DATE"] for df in changed], ignore_index=True)
+    if ref_dates.empty:
+        return None
+    return str(ref_dates.min().date())
@@ -1,3 +1,42 @@
-from ._core import previewDimensions, getTableData
+from ._core import (
+    WDSClient,
+    CubeSchema,
+    get_default_client,
+    set_default_client,
+    instrument,
+    getCubeSchema,
+    getChangedCubeList,
+    previewDimensions,
+    iterCoordinates,
+    renderCoordinates,
+    getTableData,
+    getChangedTableData,
+    getReleasedTableData,
+    getBulkVectorDataByRange,
+    iterTableData,
+    TableDataStream,
+)
+from ._async import AsyncWDSClient
+from ._instrument import Event, Metrics
 
-__all__ = ["previewDimensions", "getTableData"]
\ No newline at end of file
+__all__ = [
+    "WDSClient",
+    "AsyncWDSClient",
+    "CubeSchema",
+    "get_default_client",
+    "set_default_client",
+    "instrument",
+    "Event",
+    "Metrics",
+    "getCubeSchema",
+    "getChangedCubeList",
+    "previewDimensions",
+    "iterCoordinates",
+    "renderCoordinates",
+    "getTableData",
+    "getChangedTableData",
+    "getReleasedTableData",
+    "getBulkVectorDataByRange",
+    "iterTableData",
+    "TableDataStream",
+]
\ No newline at end of file
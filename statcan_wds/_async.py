@@ -0,0 +1,391 @@
+"""
+asyncio counterpart of `WDSClient`, built on httpx.
+
+`AsyncWDSClient` mirrors the blocking client's endpoints as coroutines
+(`get_cube_metadata`, `get_vector_ids`, `get_table_data`, ...) so many cubes and
+retrieval shards can be `gather`ed from one event loop over a pooled
+`httpx.AsyncClient`, without a thread per request. It shares the on-disk caches,
+`CubeSchema`, and frame assembly with the blocking client; cache reads and
+writes run in worker threads (`asyncio.to_thread`) so they never block the loop.
+
+httpx is an optional dependency (`pip install "statcan_wds[async]"`); it is only
+imported when an `AsyncWDSClient` is created.
+"""
+
+import asyncio
+from collections import deque
+from datetime import timedelta
+from itertools import islice
+
+from ._backends import check_backend
+from ._cache import MetadataCache, VectorCache
+from ._fields import check_fields
+from ._json import ACCEPT_ENCODING, Transfer, ijson, incomplete_json, iter_json, read_json
+from ._core import (
+    _MAX_CHANGED_LIST_DAYS,
+    _RESOLVE_CHUNK,
+    CubeSchema,
+    _assemble_frame,
+    _changed_cubes,
+    _check_resolved,
+    _incremental_json,
+    _metadata_object,
+    _refperiod_windows,
+    _released_after,
+    _series_info,
+    _series_labels,
+    _shard_points,
+    _to_wds_time,
+    _wds_now,
+    _wide_layout,
+    default_base_url,
+)
+from ._throttle import THROTTLE_STATUSES, AsyncAdaptiveConcurrency, RateLimiter, backoff_delay
+
+
+class _AsyncChunkReader:
+    """Async file-like view (`await read(n)`) over an async iterator of byte chunks, for ijson."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+        self.bytes_read = 0
+
+    async def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.bytes_read += len(data)
+        return data
+
+
+class AsyncWDSClient:
+    """
+    Pooled asyncio client for the WDS REST API.
+
+    Parameters
+    ----------
+    base_url : str or None
+        Root of the WDS REST API; defaults to `default_base_url()`.
+    max_connections : int
+        Maximum number of concurrent connections in the httpx pool.
+    max_keepalive : int
+        Maximum number of idle keep-alive connections kept in the pool.
+    timeout : float or (float, float)
+        A single timeout, or a (connect, read) tuple in seconds.
+    cache, cache_dir, changed_list_ttl :
+        Metadata / vector cache settings; same meaning as for `WDSClient`.
+    resolve_batch_size, vectors_per_request, window_years :
+        Batching and sharding settings; same meaning as for `WDSClient`.
+    max_concurrency : int
+        Maximum number of WDS requests in flight at once from this client. The
+        actual limit adapts to HTTP 429/503 answers, as in `WDSClient`.
+    requests_per_second, burst, max_attempts, backoff_base, backoff_cap :
+        Rate limiting and retry settings; same meaning as for `WDSClient`.
+    json_loads, incremental_json, transfer_log_size :
+        Response decoding and transfer logging; same meaning as for `WDSClient`.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     async with AsyncWDSClient() as client:
+    ...         return await asyncio.gather(
+    ...             client.get_table_data(18100006, CPI_SPECS),
+    ...             client.get_table_data(14100287, LFS_SPECS),
+    ...         )
+    >>> cpi, lfs = asyncio.run(main())
+    """
+
+    def __init__(self, base_url=None, max_connections=10, max_keepalive=10,
+                 timeout=(10, 120), cache=True, cache_dir=None, changed_list_ttl=900,
+                 resolve_batch_size=300, max_concurrency=8, vectors_per_request=50,
+                 window_years=10, requests_per_second=10, burst=None, max_attempts=5,
+                 backoff_base=0.5, backoff_cap=30.0, json_loads=None,
+                 incremental_json=False, transfer_log_size=1000):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "AsyncWDSClient requires httpx; install it with `pip install httpx`."
+            ) from e
+
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.base_url = (base_url or default_base_url()).rstrip("/")
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+            ),
+            timeout=httpx.Timeout(read, connect=connect),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+        )
+        self.metadata_cache = MetadataCache(cache_dir) if cache else None
+        self.vector_cache = VectorCache(cache_dir) if cache else None
+        self.changed_list_ttl = changed_list_ttl
+        self.resolve_batch_size = resolve_batch_size
+        self.rate_limiter = RateLimiter(requests_per_second, burst)
+        self.concurrency = AsyncAdaptiveConcurrency(max_concurrency, maximum=max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.vectors_per_request = vectors_per_request
+        self.window_years = window_years
+        self.json_loads = json_loads
+        self.incremental_json = _incremental_json(incremental_json)
+        self.transfers = deque(maxlen=transfer_log_size)
+        self._transfer_totals = {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0}
+        self._changed_today = {}  # {date: (checked_at, {pid: releaseTime})}
+        self._schemas = {}  # {pid: Task[CubeSchema]}, memoized for the client's lifetime
+
+    async def aclose(self):
+        """Close the underlying httpx client and release pooled connections."""
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    # --- HTTP helpers -------------------------------------------------------
+
+    async def _request(self, method, endpoint, payload=None):
+        """Send one request through the throttle; see `WDSClient._request`."""
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_attempts):
+            await self.concurrency.acquire()
+            try:
+                delay = self.rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with self.http.stream(method, url, json=payload) as response:
+                    if response.status_code not in THROTTLE_STATUSES:
+                        response.raise_for_status()  # surface non-2xx HTTP errors immediately
+                        data = await self._read_body(endpoint, response)
+            finally:
+                await self.concurrency.release()
+
+            if response.status_code not in THROTTLE_STATUSES:
+                await self.concurrency.on_success()
+                return data
+            await self.concurrency.on_throttle()
+            if attempt + 1 < self.max_attempts:
+                await asyncio.sleep(backoff_delay(
+                    attempt, self.backoff_base, self.backoff_cap,
+                    retry_after=response.headers.get("Retry-After"),
+                ))
+
+        response.raise_for_status()
+
+    async def _read_body(self, endpoint, response):
+        """Decompress and decode a streamed response. See `WDSClient._read_body`."""
+        if self.incremental_json:
+            reader = _AsyncChunkReader(response.aiter_bytes())
+            try:
+                async for data in iter_json(reader):
+                    break
+                else:
+                    raise incomplete_json(reader)
+            except ijson.JSONError as exc:
+                raise incomplete_json(reader) from exc
+            decoded = reader.bytes_read
+        else:
+            data, decoded = read_json([chunk async for chunk in response.aiter_bytes()], self.json_loads)
+        transfer = Transfer(
+            endpoint.split("?", 1)[0],
+            response.num_bytes_downloaded,  # bytes received, before decompression
+            decoded,
+            response.headers.get("Content-Encoding"),
+        )
+        self.transfers.append(transfer)
+        self._transfer_totals["requests"] += 1
+        self._transfer_totals["wire_bytes"] += transfer.wire_bytes
+        self._transfer_totals["decoded_bytes"] += transfer.decoded_bytes
+        return data
+
+    def transfer_totals(self):
+        """Cumulative transfer statistics. See `WDSClient.transfer_totals`."""
+        totals = dict(self._transfer_totals)
+        totals["ratio"] = totals["decoded_bytes"] / totals["wire_bytes"] if totals["wire_bytes"] else None
+        return totals
+
+    async def _post(self, endpoint, payload):
+        return await self._request("POST", endpoint, payload)
+
+    async def _get(self, endpoint):
+        return await self._request("GET", endpoint)
+
+    # --- WDS endpoints ------------------------------------------------------
+
+    async def get_cube_metadata(self, pid):
+        """Fetch cube metadata, via the disk cache when enabled. See `WDSClient.get_cube_metadata`."""
+        if self.metadata_cache is None:
+            return await self._fetch_cube_metadata(pid)
+
+        now = _wds_now()
+        entry = await asyncio.to_thread(self.metadata_cache.load, pid)
+        checked = None
+        if entry is not None:
+            checked = await self._unchanged_through(pid, entry["validated_at"], now, _MAX_CHANGED_LIST_DAYS)
+        if checked is not None:
+            await asyncio.to_thread(self.metadata_cache.mark_validated, pid, entry, checked)
+            return entry["object"]
+
+        meta = await self._fetch_cube_metadata(pid)
+        await asyncio.to_thread(self.metadata_cache.store, pid, meta, now)
+        return meta
+
+    async def _fetch_cube_metadata(self, pid):
+        return _metadata_object(await self._post("getCubeMetadata", [{"productId": pid}]))
+
+    async def get_cube_schema(self, pid):
+        """Return the memoized `CubeSchema` for `pid`; concurrent callers share one fetch."""
+        pid = int(pid)
+        task = self._schemas.get(pid)
+        if task is None:
+            async def build():
+                return CubeSchema(pid, await self.get_cube_metadata(pid))
+            task = self._schemas[pid] = asyncio.ensure_future(build())
+        try:
+            return await task
+        except Exception:
+            self._schemas.pop(pid, None)  # don't memoize failures
+            raise
+
+    async def get_changed_cubes(self, day, refresh=False):
+        """Return {productId: releaseTime} for cubes republished on `day`. See `WDSClient.get_changed_cubes`."""
+        return (await self._changed_list(day, refresh))[0]
+
+    async def _changed_list(self, day, refresh=False):
+        """(changed, as_of) for `day`. See `WDSClient._changed_list`."""
+        day = _to_wds_time(day).date()
+        today = _wds_now().date()
+
+        if day < today and self.metadata_cache is not None:
+            changed = await asyncio.to_thread(self.metadata_cache.load_changed, day)
+            if changed is not None:
+                return changed, None
+        elif day == today and not refresh:
+            hit = self._changed_today.get(day)
+            if hit is not None and (_wds_now() - hit[0]).total_seconds() < self.changed_list_ttl:
+                return hit[1], hit[0]
+
+        checked_at = _wds_now()
+        changed = _changed_cubes(await self._get(f"getChangedCubeList/{day.isoformat()}"))
+
+        if day < today and self.metadata_cache is not None:
+            await asyncio.to_thread(self.metadata_cache.store_changed, day, changed)
+        elif day == today:
+            self._changed_today = {day: (checked_at, changed)}
+        return changed, (None if day < today else checked_at)
+
+    async def _unchanged_through(self, pid, since, now, max_days=None):
+        """None if cube `pid` was released after `since`. See `WDSClient._unchanged_through`."""
+        pid = int(pid)
+        if max_days is not None and (now.date() - since.date()).days > max_days:
+            return None
+        day, checked = since.date(), now
+        while day <= now.date():
+            changed, as_of = await self._changed_list(day)
+            release = changed.get(pid)
+            # A release on the watermark day only counts if it came after it
+            if release is not None and (day > since.date() or _released_after(release, since)):
+                return None
+            if as_of is not None:
+                checked = min(checked, as_of)
+            day += timedelta(days=1)
+        return checked
+
+    async def resolve_coordinates(self, pid, coords):
+        """
+        Resolve coordinates to {coordinate: (vectorId, title)}. See `WDSClient.resolve_coordinates`.
+
+        Like the blocking client, `coords` is consumed `_RESOLVE_CHUNK` at a time,
+        so a lazy selection is never materialized whole.
+        """
+        async def resolve_batch(batch):
+            return _series_info(batch, await self._post(
+                "getSeriesInfoFromCubePidCoord",
+                [{"productId": pid, "coordinate": c} for c in batch],
+            ))
+
+        result = {}
+        coords = iter(coords)
+        step = self.resolve_batch_size
+        while True:
+            raw = list(islice(coords, _RESOLVE_CHUNK))
+            if not raw:
+                break
+            chunk = [c for c in dict.fromkeys(raw) if c not in result]  # dedupe, keep order
+            known = (
+                await asyncio.to_thread(self.vector_cache.lookup, pid, chunk)
+                if self.vector_cache is not None else {}
+            )
+
+            missing = [c for c in chunk if c not in known]
+            if missing:
+                parts = await asyncio.gather(*(
+                    resolve_batch(missing[i:i + step]) for i in range(0, len(missing), step)
+                ))
+                resolved = {}
+                for part in parts:
+                    resolved.update(part)
+                if self.vector_cache is not None:
+                    await asyncio.to_thread(self.vector_cache.store, pid, resolved)
+                known.update(resolved)
+
+            result.update((c, known[c]) for c in chunk if c in known)
+        return result
+
+    async def get_vector_ids(self, pid, coords):
+        """Resolve coordinates to {vectorId: SeriesTitleEn}. See `getVectorIds`."""
+        if isinstance(coords, (list, tuple)) and len(coords) == 0:
+            raise Exception("Invalid coordinates. Please specify all required dimensions")
+
+        return dict(_check_resolved(await self.resolve_coordinates(pid, coords), coords).values())
+
+    async def get_vector_data(self, vector_ids, startRefPeriod, endRefPeriod):
+        """Fetch raw datapoints for `vector_ids` over a reference-period range (one request)."""
+        vectorIds = ",".join([f'"{v}"' for v in vector_ids])
+        return await self._get(
+            "getDataFromVectorByReferencePeriodRange"
+            f"?vectorIds={vectorIds}&startRefPeriod={startRefPeriod}&endReferencePeriod={endRefPeriod}"
+        )
+
+    async def fetch_vector_data(self, vector_ids, startRefPeriod, endRefPeriod):
+        """Sharded retrieval gathered on the event loop. See `WDSClient.fetch_vector_data`."""
+        vector_ids = list(vector_ids)
+        step = self.vectors_per_request or len(vector_ids) or 1
+        windows = _refperiod_windows(startRefPeriod, endRefPeriod, self.window_years)
+        shards = [
+            (vector_ids[i:i + step], start, end)
+            for i in range(0, len(vector_ids), step)
+            for start, end in windows
+        ]
+        results = await asyncio.gather(*(self.get_vector_data(*shard) for shard in shards))
+
+        points = {v: [] for v in vector_ids}
+        for items in results:
+            for vId, pts in _shard_points(items).items():
+                points[vId].extend(pts)
+        return points
+
+    async def get_table_data(self, pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                             backend="pandas", layout="tidy", columns_from=None, index_from=None,
+                             fields=None, apply_scalar_factor=False):
+        """Fetch a tidy (or wide) DataFrame for `series_specs`. See `getTableData`."""
+        check_backend(backend)
+        fields = check_fields(fields)
+        schema = await self.get_cube_schema(pid)
+        coords = schema.iter_coordinates(series_specs)
+        resolved = _check_resolved(await self.resolve_coordinates(pid, coords), coords)
+        vector_ids, labels = _series_labels(series_specs, schema, resolved)
+        wide = _wide_layout(layout, columns_from, index_from, labels.columns, fields)
+
+        series = await self.fetch_vector_data(vector_ids, startRefPeriod, endRefPeriod)
+        return _assemble_frame(series, labels, backend, wide, fields, apply_scalar_factor)
@@ -0,0 +1,96 @@
+"""
+Arrow and Polars result backends for `getTableData`.
+
+The result (tidy or wide) is assembled from flat columns: dictionary-encoded
+labels, REF_DATE, and one or more float value columns. These builders turn those
+columns straight into a `pyarrow.Table` or a `polars.DataFrame`, so callers
+feeding Arrow-based tooling don't pay for an intermediate pandas frame and a
+conversion copy.
+
+Column types mirror the pandas backend:
+
+- dimension labels: dictionary-encoded (`pa.dictionary(int32, string)` /
+  `pl.Categorical`), one entry per distinct label;
+- REF_DATE: `date32` / `pl.Date`;
+- VALUE (or one column per series in the wide layout): `float64`, with missing
+  observations as nulls;
+- optional datapoint attributes (see `_fields`): `int8` codes and a
+  millisecond `timestamp` / `Datetime` release time, with nulls.
+
+pyarrow and polars are optional dependencies, imported only when requested.
+"""
+
+import importlib
+
+import numpy as np
+
+
+BACKENDS = ("pandas", "arrow", "polars")
+
+
+def _require(module, backend):
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f'backend="{backend}" requires {module}; install it with `pip install {module}`.'
+        ) from e
+
+
+def check_backend(backend):
+    """Raise ValueError for an unknown backend name."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Expected backend 'pandas', 'arrow' or 'polars' but received: '{backend}'")
+
+
+def _ref_days(ref_dates):
+    """YYYY-MM-DD strings -> datetime64[D] (numpy parses ISO dates natively)."""
+    return np.asarray(ref_dates, dtype=object).astype("datetime64[D]")
+
+
+def to_arrow(label_columns, ref_dates, value_columns, field_columns=None):
+    """
+    Build a `pyarrow.Table`.
+
+    Parameters
+    ----------
+    label_columns : dict
+        {column: (row_codes, categories)}, with row_codes -1 for a missing label.
+    ref_dates : array-like of str
+        REF_DATE per row (YYYY-MM-DD).
+    value_columns : dict
+        {column: numpy.ndarray} of float64 values per row (NaN for missing).
+    field_columns : dict or None
+        {column: (values, missing)} attribute columns from `_fields.field_array`.
+    """
+    pa = _require("pyarrow", "arrow")
+    columns = {}
+    for col, (codes, categories) in label_columns.items():
+        indices = pa.array(codes.astype(np.int32), mask=codes < 0)
+        columns[col] = pa.DictionaryArray.from_arrays(indices, pa.array(list(categories), type=pa.string()))
+    columns["REF_DATE"] = pa.array(_ref_days(ref_dates))
+    for col, values in value_columns.items():
+        columns[col] = pa.array(values, type=pa.float64(), from_pandas=True)  # NaN -> null
+    for col, (values, missing) in (field_columns or {}).items():
+        columns[col] = pa.array(values, mask=missing, from_pandas=True)  # NaT -> null
+    return pa.table(columns)
+
+
+def to_polars(label_columns, ref_dates, value_columns, field_columns=None):
+    """Build a `polars.DataFrame`; same inputs as `to_arrow`."""
+    pl = _require("polars", "polars")
+    columns = []
+    for col, (codes, categories) in label_columns.items():
+        # A trailing null category stands in for missing labels (code -1)
+        lookup = pl.Series(col, [*categories, None], dtype=pl.Categorical)
+        columns.append(lookup.gather(np.where(codes < 0, len(categories), codes)))
+    columns.append(pl.Series("REF_DATE", _ref_days(ref_dates)))
+    for col, values in value_columns.items():
+        columns.append(pl.Series(col, values, dtype=pl.Float64).fill_nan(None))
+    for col, (values, missing) in (field_columns or {}).items():
+        series = pl.Series(col, values)
+        if missing is not None:
+            nulls = pl.repeat(None, len(series), dtype=series.dtype, eager=True)
+            series = series.zip_with(pl.Series(~missing), nulls)
+        columns.append(series)
+    return pl.DataFrame(columns)
@@ -0,0 +1,105 @@
+"""
+Full-table bulk mode for `getTableData`.
+
+For wide selections it is cheaper to download a cube's zipped full-table CSV once
+(`getFullTableDownloadCSV`) than to resolve every coordinate and fetch every vector
+as JSON. This module parses that CSV in chunks, keeping only the rows of the
+selected coordinates and reference-period range.
+"""
+
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ._fields import BULK_FIELDS
+
+
+# Only these columns of the full-table CSV are parsed, with explicit dtypes
+BULK_DTYPES = {
+    "REF_DATE": str,
+    "VECTOR": str,
+    "COORDINATE": str,
+    "VALUE": np.float64,
+}
+
+
+def short_coordinate(coordinate, n_dims):
+    """Trim a 10-slot WDS coordinate to the `n_dims` slots used in the CSV ("1.2.0..." -> "1.2")."""
+    return ".".join(coordinate.split(".")[:n_dims])
+
+
+def _normalize_ref_dates(ref):
+    """Pad CSV reference periods to YYYY-MM-DD ("2020" -> "2020-01-01", "2020-01" -> "2020-01-01")."""
+    lengths = ref.str.len()
+    ref = ref.where(lengths != 7, ref + "-01")
+    return ref.where(lengths != 4, ref + "-01-01")
+
+
+def read_bulk_csv(zip_path, pid, coordinates, startRefPeriod, endRefPeriod, chunksize=500_000, fields=()):
+    """
+    Extract the selected series from a zipped full-table CSV.
+
+    Parameters
+    ----------
+    zip_path : str or Path
+        Downloaded `<pid>-eng.zip`.
+    pid : int or str
+        productId; the data member inside the zip is `<pid>.csv`.
+    coordinates : list[str]
+        Selected coordinates in the CSV's short form (see `short_coordinate`).
+    startRefPeriod, endRefPeriod : str
+        Inclusive reference-period range (YYYY-MM-DD).
+    chunksize : int
+        Rows parsed per chunk; bounds peak memory regardless of cube size.
+    fields : tuple[str]
+        Datapoint attributes to keep, among those in `BULK_FIELDS`.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, dict, numpy.ndarray)
+        Per kept row: position of its coordinate in `coordinates`, vectorId,
+        REF_DATE (YYYY-MM-DD), VALUE and {field: float64 codes (NaN if
+        missing)}, ordered by coordinate then date; then, per coordinate,
+        whether the table has any row for it at all (regardless of dates).
+    """
+    start, end = str(startRefPeriod)[:10], str(endRefPeriod)[:10]
+    targets = pd.Index(coordinates)
+    dtypes = dict(BULK_DTYPES, **{BULK_FIELDS[f]: np.float64 for f in fields})
+
+    positions, vectors, ref_dates, values = [], [], [], []
+    extras = {f: [] for f in fields}
+    matched = np.zeros(len(targets), dtype=bool)
+    with zipfile.ZipFile(zip_path) as zf, zf.open(f"{int(pid)}.csv") as f:
+        reader = pd.read_csv(f, usecols=list(dtypes), dtype=dtypes, chunksize=chunksize)
+        for chunk in reader:
+            pos = targets.get_indexer(chunk["COORDINATE"])
+            matched[pos[pos >= 0]] = True
+            ref = _normalize_ref_dates(chunk["REF_DATE"])
+            keep = (pos >= 0) & ((ref >= start) & (ref <= end)).to_numpy()
+            if not keep.any():
+                continue
+            positions.append(pos[keep])
+            vectors.append(chunk["VECTOR"].to_numpy()[keep])
+            ref_dates.append(ref.to_numpy()[keep])
+            values.append(chunk["VALUE"].to_numpy()[keep])
+            for field, parts in extras.items():
+                parts.append(chunk[BULK_FIELDS[field]].to_numpy()[keep])
+
+    if not positions:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=object), np.empty(0, dtype=np.float64),
+                {f: np.empty(0, dtype=np.float64) for f in fields}, matched)
+
+    rows = pd.DataFrame({
+        "pos": np.concatenate(positions),
+        "vector": np.concatenate(vectors),
+        "ref": np.concatenate(ref_dates),
+        "value": np.concatenate(values),
+        **{field: np.concatenate(parts) for field, parts in extras.items()},
+    }).sort_values(["pos", "ref"], kind="stable")
+
+    # "v41690973" -> 41690973
+    vector_ids = rows["vector"].str.slice(1).astype(np.int64).to_numpy()
+    return (rows["pos"].to_numpy(), vector_ids, rows["ref"].to_numpy(dtype=object), rows["value"].to_numpy(),
+            {field: rows[field].to_numpy() for field in fields}, matched)
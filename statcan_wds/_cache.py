@@ -0,0 +1,211 @@
+"""
+On-disk caches used by `WDSClient`.
+
+- `MetadataCache`: raw cube metadata per productId, plus the fetch/validation
+  timestamps needed to revalidate entries against WDS `getChangedCubeList`.
+  Completed days of the changed-cube list are stored too, since they never change.
+- Bulk downloads: zipped full-table CSVs (`bulk/<pid>-eng.zip`) with their
+  download time, reused until the cube is republished.
+- `VectorCache`: SQLite table of (productId, coordinate) -> (vectorId, SeriesTitleEn).
+  A coordinate always maps to the same vector, so entries never expire.
+
+Everything lives under one cache directory (see `default_cache_dir`). JSON files
+are written atomically and SQLite handles its own locking, so several processes
+(ingest runs, notebooks) can share the same directory.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+
+def default_cache_dir():
+    """
+    Resolve the cache directory.
+
+    `STATCAN_WDS_CACHE_DIR` wins; otherwise `$XDG_CACHE_HOME/statcan_wds`, falling
+    back to `~/.cache/statcan_wds`.
+    """
+    env = os.getenv("STATCAN_WDS_CACHE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.getenv("XDG_CACHE_HOME")
+    return Path(xdg or Path.home() / ".cache") / "statcan_wds"
+
+
+def _write_json(path, obj):
+    """Write `obj` to `path` atomically (temp file in the same dir + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read_json(path):
+    """Return the decoded JSON at `path`, or None if missing/corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class MetadataCache:
+    """
+    Disk-backed store of cube metadata keyed by productId.
+
+    Layout under `cache_dir`:
+      - metadata/<pid>.json : {"productId", "fetched_at", "validated_at", "object"}
+      - metadata/<pid>.validated.json : {"fetched_at", "validated_at"}, the latest
+        revalidation, kept apart so it never rewrites the (possibly large) metadata
+      - changed/<YYYY-MM-DD>.json : {pid: releaseTime} for a completed day
+      - bulk/<pid>-eng.zip (+ .json) : full-table CSV download and its fetch time
+
+    Timestamps are naive ISO strings in Eastern time, the clock WDS uses for
+    `releaseTime`.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.root = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+    def _metadata_path(self, pid):
+        return self.root / "metadata" / f"{int(pid)}.json"
+
+    def _validated_path(self, pid):
+        return self.root / "metadata" / f"{int(pid)}.validated.json"
+
+    def _changed_path(self, day):
+        return self.root / "changed" / f"{day.isoformat()}.json"
+
+    def load(self, pid):
+        """
+        Return the cached entry for `pid`, or None.
+
+        The entry's timestamps are parsed back into datetimes.
+        """
+        entry = _read_json(self._metadata_path(pid))
+        if entry is None or "object" not in entry:
+            return None
+        validated = _read_json(self._validated_path(pid))
+        entry["validated_at"] = datetime.fromisoformat(entry["validated_at"])
+        # Only a revalidation of this very fetch counts
+        if validated is not None and validated.get("fetched_at") == entry["fetched_at"]:
+            entry["validated_at"] = max(entry["validated_at"], datetime.fromisoformat(validated["validated_at"]))
+        entry["fetched_at"] = datetime.fromisoformat(entry["fetched_at"])
+        return entry
+
+    def store(self, pid, meta, fetched_at):
+        """Save freshly fetched metadata for `pid` (also counts as validated)."""
+        _write_json(self._metadata_path(pid), {
+            "productId": int(pid),
+            "fetched_at": fetched_at.isoformat(),
+            "validated_at": fetched_at.isoformat(),
+            "object": meta,
+        })
+
+    def mark_validated(self, pid, entry, validated_at):
+        """Advance an entry's validation watermark after a successful revalidation (sidecar only)."""
+        _write_json(self._validated_path(pid), {
+            "fetched_at": entry["fetched_at"].isoformat(),
+            "validated_at": validated_at.isoformat(),
+        })
+
+    def load_changed(self, day):
+        """Return the stored {pid: releaseTime} list for a completed `day`, or None."""
+        changed = _read_json(self._changed_path(day))
+        if changed is None:
+            return None
+        return {int(pid): release for pid, release in changed.items()}
+
+    def store_changed(self, day, changed):
+        """Persist the changed-cube list of a completed `day`."""
+        _write_json(self._changed_path(day), {str(pid): release for pid, release in changed.items()})
+
+    def bulk_path(self, pid):
+        """Where the full-table CSV zip of `pid` is kept."""
+        return self.root / "bulk" / f"{int(pid)}-eng.zip"
+
+    def load_bulk_stamp(self, pid):
+        """Return when the cached full-table zip of `pid` was downloaded, or None."""
+        stamp = _read_json(self.bulk_path(pid).with_suffix(".json"))
+        if stamp is None or not self.bulk_path(pid).exists():
+            return None
+        return datetime.fromisoformat(stamp["fetched_at"])
+
+    def store_bulk_stamp(self, pid, fetched_at):
+        """Record the download time of the full-table zip of `pid`."""
+        _write_json(self.bulk_path(pid).with_suffix(".json"), {"fetched_at": fetched_at.isoformat()})
+
+
+class VectorCache:
+    """
+    Persistent (productId, coordinate) -> (vectorId, SeriesTitleEn) mapping.
+
+    Backed by `vectors.sqlite` under `cache_dir`. Only valid resolutions are
+    stored (vectorId != 0), since an invalid coordinate may become valid later.
+    A short-lived connection is opened per call, so one instance can be shared
+    across threads and several processes can use the same file.
+    """
+
+    # Stay well below SQLite's limit on bound parameters per statement
+    _CHUNK = 500
+
+    def __init__(self, cache_dir=None):
+        root = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = root / "vectors.sqlite"
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS vectors ("
+                    " pid INTEGER NOT NULL,"
+                    " coordinate TEXT NOT NULL,"
+                    " vector_id INTEGER NOT NULL,"
+                    " title TEXT,"
+                    " PRIMARY KEY (pid, coordinate))"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, pid, coords):
+        """Return {coordinate: (vectorId, title)} for the cached subset of `coords`."""
+        coords = list(coords)
+        found = {}
+        conn = self._connect()
+        try:
+            for i in range(0, len(coords), self._CHUNK):
+                chunk = coords[i:i + self._CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT coordinate, vector_id, title FROM vectors"
+                    f" WHERE pid = ? AND coordinate IN ({marks})",
+                    [int(pid), *chunk],
+                )
+                found.update({c: (v, t) for c, v, t in rows})
+        finally:
+            conn.close()
+        return found
+
+    def store(self, pid, resolved):
+        """Insert/refresh {coordinate: (vectorId, title)} entries for `pid`."""
+        rows = [(int(pid), c, int(v), t) for c, (v, t) in resolved.items() if v]
+        if not rows:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
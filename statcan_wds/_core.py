@@ -11,58 +11,1787 @@ Design:
   ordered by dimensionPositionId, padded to 10 slots with '0').
 - A "vector" is a single time series (fixed non-time dims) identified by vectorId.
 
+- All HTTP traffic goes through a `WDSClient`, which owns a pooled keep-alive
+  `requests.Session`. The module-level functions are thin wrappers over a shared
+  default client (see `get_default_client` / `set_default_client`).
+- Cube metadata is cached on disk and revalidated against `getChangedCubeList`,
+  so repeated runs skip metadata downloads for cubes that have not been republished.
+- Within a process, each cube's metadata is indexed once into a `CubeSchema`
+  (memoized per client), which every helper below shares.
+- Coordinate -> vectorId resolutions are kept in a persistent SQLite cache; only
+  coordinates never seen before are sent to WDS, in size-capped batches dispatched
+  concurrently on a bounded thread pool.
+- Wide selections can be served from the cube's full-table CSV download instead
+  (`mode="bulk"`), chosen automatically from the selected fraction of the cube.
+- `getChangedTableData` returns only the points added or revised since a stored
+  watermark, using the changed-cube lists and changed-series endpoints;
+  `getReleasedTableData` / `getBulkVectorDataByRange` return the points released
+  in a given time window (revisions included).
+- Every request passes a client-side token-bucket rate limiter and an adaptive
+  concurrency limit; HTTP 429/503 answers are retried with jittered backoff.
+- Data retrieval is sharded by vector groups and reference-period windows; shards
+  are fetched concurrently and stitched back in a deterministic order, or streamed
+  frame by frame with `iterTableData`.
+- An optional `on_event` callback receives `Event`s for phase timings, requests
+  (with bytes transferred), throttled answers and cache hits/misses (see
+  `_instrument`); without one, the hooks cost a None check.
+
 NOTE: This module prints in a few places (preview, debug). Consider returning data
 structures instead for library-style usage.
 """
 
+import difflib
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-from itertools import product
+from itertools import islice, product
+from pathlib import Path
+
+from ._backends import check_backend, to_arrow, to_polars
+from ._bulk import read_bulk_csv, short_coordinate
+from ._cache import MetadataCache, VectorCache
+from ._fields import BULK_FIELDS, FIELDS, check_fields, fetched_fields, field_array, scale_values, to_pandas
+from ._instrument import Event
+from ._json import ACCEPT_ENCODING, CHUNK_SIZE, Transfer, ijson, point_columns, point_fields, read_json
+from ._throttle import THROTTLE_STATUSES, AdaptiveConcurrency, RateLimiter, backoff_delay
+
+try:
+    from zoneinfo import ZoneInfo
+    _WDS_TZ = ZoneInfo("America/Toronto")
+except Exception:  # no tz database available; fall back to local time
+    _WDS_TZ = None
 
 
 BASE = "https://www150.statcan.gc.ca/t1/wds/rest"
 
 
-def getCubeMetadata(pid):
+def default_base_url():
+    """
+    Resolve the WDS root URL: `STATCAN_WDS_BASE_URL` if set (e.g. a local
+    stand-in server), else `BASE`.
+    """
+    return os.getenv("STATCAN_WDS_BASE_URL") or BASE
+
+# Coordinates consumed per step when resolving a (possibly lazy) selection
+_RESOLVE_CHUNK = 50_000
+
+# Longest watermark gap, in days, walked one getChangedCubeList request per day;
+# past it, a refetch is cheaper than the walk, so the cube is treated as changed
+_MAX_CHANGED_LIST_DAYS = 7
+
+# Vectorized string ops for coordinate rendering (StringDType needs numpy >= 2)
+try:
+    _STR_DTYPE = np.dtypes.StringDType()
+    _str_add = np.strings.add
+except AttributeError:
+    _STR_DTYPE = str
+    _str_add = np.char.add
+
+# WDS `refPer` (and normalized full-table REF_DATE) format
+REF_DATE_FORMAT = "%Y-%m-%d"
+
+
+def _wds_now():
+    """Current time as a naive datetime on the WDS (Eastern) clock."""
+    return datetime.now(_WDS_TZ).replace(tzinfo=None)
+
+
+def _to_wds_time(ts):
+    """
+    Normalize a watermark (datetime or ISO string) to a naive Eastern datetime.
+
+    Timezone-aware values are converted; naive ones are assumed to already be
+    on the WDS clock.
+    """
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    elif not isinstance(ts, datetime):  # a plain date: start of that day
+        ts = datetime.combine(ts, datetime.min.time())
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(_WDS_TZ).replace(tzinfo=None)
+    return ts
+
+
+def _metadata_object(data):
+    """Validate a `getCubeMetadata` response and return its metadata object."""
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"Unexpected payload: {data}")
+
+    item = data[0]
+    if item.get("status") != "SUCCESS":
+        # WDS-level error even though HTTP was 200
+        raise RuntimeError(f"WDS error: {item.get('status')} | {item.get('object')}")
+    return item["object"]
+
+
+def _changed_cubes(data):
+    """Validate a `getChangedCubeList` response and return {productId: releaseTime}."""
+    if not isinstance(data, dict) or data.get("status") != "SUCCESS":
+        raise RuntimeError(f"WDS error: {data}")
+    return {int(c["productId"]): c.get("releaseTime") for c in data.get("object") or []}
+
+
+def _series_info(batch, series):
+    """Pair a `getSeriesInfoFromCubePidCoord` response with its coordinates.
+
+    Returns {coordinate: (vectorId, title)} for the valid ones; WDS answers
+    positionally and invalid combos come back with vectorId 0.
+    """
+    return {
+        c: (s["object"]["vectorId"], s["object"].get("SeriesTitleEn"))
+        for c, s in zip(batch, series)
+        if s["object"].get("vectorId", 0) != 0
+    }
+
+
+def _index_columns(series_specs, dim_map):
+    """
+    Dimension columns named in `series_specs`, sorted by the cube's
+    dimensionPositionId (the order of the coordinate slots).
+
+    Each becomes a label column whose values are the member names of the
+    memberIds in that dimension's coordinate slot (see `LabelTable.from_coordinates`).
+    """
+    index_cols = [list(spec.keys())[0] for spec in series_specs]
+    index_cols.sort(key=lambda col: dim_map.get(col, float("inf")))
+    return index_cols
+
+
+def _spec_size(series_specs):
+    """Number of series a compact spec expands to, without expanding it."""
+    n = 1
+    for dim in series_specs:
+        (_, v), = dim.items()
+        n *= len(v) if isinstance(v, (list, tuple)) else 1
+    return n
+
+
+def _series_labels(series_specs, schema, resolved):
+    """
+    Vector IDs and their dimension labels from resolved coordinates.
+
+    Parameters
+    ----------
+    resolved : dict
+        {coordinate: (vectorId, title)} as returned by `resolve_coordinates`.
+
+    Returns
+    -------
+    (list[int], LabelTable)
+        vector IDs in resolution order, and their labels, read off each
+        coordinate's memberIds.
+    """
+    label_cols = [col for col in _index_columns(series_specs, schema.positions) if col in schema.positions]
+    vector_ids = [v for v, _ in resolved.values()]
+    return vector_ids, LabelTable.from_coordinates(schema, vector_ids, list(resolved), label_cols)
+
+
+def _check_resolved(resolved, coords):
+    """Raise if no coordinate of `coords` resolved to a vector; return `resolved`."""
+    # All-invalid case: WDS answers vectorId 0 for every combination
+    if not resolved:
+        shown = coords if isinstance(coords, (list, tuple)) and len(coords) <= 20 else "(selection)"
+        raise Exception(f"Failed to retrieve vectors for coordinates: {shown}. Please specify all required dimensions")
+    return resolved
+
+
+class LabelTable:
+    """
+    Compact key -> dimension label table (keys are vectorIds, or row positions in
+    bulk mode), built once per call.
+
+    Each label column is dictionary-encoded: one integer code per key plus the
+    distinct labels. Frame assembly joins labels onto datapoints with integer
+    `take`s, so no per-vector string work happens while the frame is built, and
+    every frame built from one table (e.g. the shards of a `TableDataStream`)
+    shares the same categories.
+
+    Attributes
+    ----------
+    keys : list
+        Row keys, in table order.
+    columns : list[str]
+        Label columns, in output order.
+    codes : dict
+        {column: numpy.ndarray} code per key (-1 for a missing label).
+    categories : dict
+        {column: pandas.Index} distinct labels.
+    """
+
+    def __init__(self, keys, columns, codes, categories):
+        self.keys = list(keys)
+        self.columns = list(columns)
+        self.codes = codes
+        self.categories = categories
+        self._rows = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def from_coordinates(cls, schema, keys, coordinates, columns):
+        """
+        Label `keys` by their `coordinates` through the schema's memberId -> name index.
+
+        The coordinates are parsed into a memberId matrix in one pass; each
+        column's distinct memberIds are then named once.
+        """
+        if len(keys):
+            ids = np.array(".".join(coordinates).split("."), dtype=np.int64).reshape(len(keys), -1)
+        else:
+            ids = np.zeros((0, 10), dtype=np.int64)
+        codes, categories = {}, {}
+        for col in columns:
+            member_codes, member_ids = pd.factorize(ids[:, schema.positions[col] - 1])
+            names = schema.member_names[col]
+            name_codes, categories[col] = pd.factorize(
+                np.array([names.get(int(m)) for m in member_ids], dtype=object)
+            )
+            codes[col] = name_codes.take(member_codes)
+        return cls(keys, columns, codes, categories)
+
+    @classmethod
+    def from_dict(cls, labels, columns):
+        """Build from {key: {column: label}}."""
+        keys = list(labels)
+        codes, categories = {}, {}
+        for col in columns:
+            codes[col], categories[col] = pd.factorize(np.array([labels[k].get(col) for k in keys], dtype=object))
+        return cls(keys, columns, codes, categories)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self, keys):
+        """Table positions of `keys`."""
+        keys = list(keys)
+        if keys == self.keys:
+            return np.arange(len(keys))
+        return np.fromiter(map(self._rows.__getitem__, keys), dtype=np.intp, count=len(keys))
+
+    def label(self, col, row):
+        """Label of table row `row` in `col` (None if missing)."""
+        code = self.codes[col][row]
+        return self.categories[col][code] if code >= 0 else None
+
+    def to_frame(self):
+        """One row per key (index: vectorId) with Categorical label columns."""
+        df = pd.DataFrame({
+            col: pd.Categorical.from_codes(self.codes[col], self.categories[col]) for col in self.columns
+        }, index=pd.Index(self.keys, name="vectorId"))
+        return df
+
+
+def _add_years(d, years):
+    """Shift a date by whole years (Feb 29 falls back to Feb 28)."""
+    try:
+        return d.replace(year=d.year + years)
+    except ValueError:
+        return d.replace(year=d.year + years, day=28)
+
+
+def _refperiod_windows(startRefPeriod, endRefPeriod, years):
+    """
+    Split an inclusive [start, end] reference-period range into consecutive,
+    non-overlapping windows of at most `years` years.
+
+    Returns a list of (start, end) ISO date strings in chronological order.
+    """
+    start = date.fromisoformat(str(startRefPeriod)[:10])
+    end = date.fromisoformat(str(endRefPeriod)[:10])
+    if not years or years <= 0:
+        return [(start.isoformat(), end.isoformat())]
+
+    windows = []
+    while start <= end:
+        stop = min(_add_years(start, years) - timedelta(days=1), end)
+        windows.append((start.isoformat(), stop.isoformat()))
+        start = stop + timedelta(days=1)
+    return windows
+
+
+def _assemble_frame(series, labels, backend="pandas", wide=None, fields=(), apply_scalar_factor=False):
+    """
+    Build the tidy result frame in one pass from per-vector datapoint lists.
+
+    Parameters
+    ----------
+    series : dict
+        {vectorId: [datapoint, ...]} as returned by `WDSClient.fetch_vector_data`.
+    labels : LabelTable
+        Dimension labels of every vector in `series` (its `columns`, in output order).
+    backend : {"pandas", "arrow", "polars"}
+        Output type (see `_frame_from_arrays`).
+    wide : (list[str], list[str]) or None
+        Wide layout from `_wide_layout`; None for the tidy layout.
+    fields : tuple[str]
+        Datapoint attributes to add as columns (see `_fields`).
+    apply_scalar_factor : bool
+        Multiply each VALUE by 10**scalarFactorCode.
+
+    Returns
+    -------
+    pandas.DataFrame or pyarrow.Table or polars.DataFrame
+        label columns (Categorical) + REF_DATE (datetime64) + VALUE (float64)
+        + the `fields` columns, rows grouped by vector in `series` order.
+
+    Notes
+    -----
+    REF_DATE/VALUE (and any attributes) are extracted with `point_columns` /
+    `point_fields` straight into preallocated arrays and the label columns are
+    expanded with a single `take` per column, so the cost is linear in the
+    number of datapoints (no per-row dicts, no concat in a loop).
+    """
+    vector_ids = list(series)
+    counts = np.fromiter((len(series[v]) for v in vector_ids), dtype=np.int64, count=len(vector_ids))
+    total = int(counts.sum())
+
+    ref_dates = np.empty(total, dtype=object)
+    values = np.empty(total, dtype=np.float64)  # None (missing) becomes NaN
+    attributes = {f: np.empty(total, dtype=object) for f in fetched_fields(fields, apply_scalar_factor)}
+    offset = 0
+    for v, n in zip(vector_ids, counts):
+        ref_dates[offset:offset + n], values[offset:offset + n] = point_columns(series[v])
+        for column, raw in zip(attributes.values(), point_fields(series[v], attributes)):
+            column[offset:offset + n] = raw
+        offset += n
+
+    row_vector = np.repeat(np.arange(len(vector_ids)), counts)
+    return _frame_from_arrays(vector_ids, row_vector, ref_dates, values, labels, backend, wide,
+                              attributes, fields, apply_scalar_factor)
+
+
+def _frame_from_arrays(vector_ids, row_vector, ref_dates, values, labels, backend="pandas", wide=None,
+                       attributes=None, fields=(), apply_scalar_factor=False):
+    """
+    Build the typed result frame from columnar arrays.
+
+    `row_vector[i]` is the position in `vector_ids` of row i's vector. Each label
+    column is dictionary-encoded: the `labels` table (a `LabelTable`) already
+    holds one code per vector, expanded to rows with a single `take`, so a label
+    string is stored once however many rows repeat it. REF_DATE is parsed to a
+    date type with an explicit format and VALUE is float64.
+
+    `attributes` holds the raw datapoint attributes per row ({field: array});
+    the `fields` among them become compact columns after VALUE (see `_fields`),
+    and with `apply_scalar_factor` the values are scaled by their
+    `scalarFactorCode` in one vectorized multiply.
+
+    `wide`, when given as (columns_from, index_from) from `_wide_layout`, scatters
+    the values into one column per series instead (see `_scatter_wide`).
+
+    `backend` picks the output: a pandas DataFrame (Categorical / datetime64), or
+    a pyarrow Table / polars DataFrame built directly from the same arrays.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    attributes = {f: field_array(f, raw) for f, raw in (attributes or {}).items()}
+    if apply_scalar_factor:
+        values = scale_values(values, attributes["scalarFactorCode"])
+    field_columns = {FIELDS[f]: attributes[f] for f in fields}
+    rows = labels.rows(vector_ids)
+    if wide is not None:
+        label_columns, ref_dates, names, matrix = _scatter_wide(
+            rows, row_vector, ref_dates, values, labels, *wide
+        )
+        value_columns = {name: matrix[:, j] for j, name in enumerate(names)}
+    else:
+        label_columns = {
+            col: (labels.codes[col].take(rows).take(row_vector), labels.categories[col])
+            for col in labels.columns
+        }
+        names, matrix = ["VALUE"], values[:, None]
+        value_columns = {"VALUE": values}
+
+    if backend == "arrow":
+        return to_arrow(label_columns, ref_dates, value_columns, field_columns)
+    if backend == "polars":
+        return to_polars(label_columns, ref_dates, value_columns, field_columns)
+
+    # The (column-major) value matrix becomes the frame's float block as is;
+    # label and date columns are then inserted in front of it
+    df = pd.DataFrame(matrix, columns=pd.Index(names, dtype=object), copy=False)
+    for i, (col, (codes, categories)) in enumerate(label_columns.items()):
+        df.insert(i, col, pd.Categorical.from_codes(codes, categories))
+    df.insert(len(label_columns), "REF_DATE", pd.to_datetime(ref_dates, format=REF_DATE_FORMAT))
+    for col, column in field_columns.items():
+        df[col] = to_pandas(column)
+    return df
+
+
+def _combined_codes(labels, rows, dims):
+    """
+    Factorize the tuple of `dims` labels of each table row in `rows`.
+
+    Returns (codes, first): a code per entry of `rows` (tuples numbered in
+    category order, the order `pivot_table` sorts Categorical keys in), and the
+    position in `rows` where each tuple first occurs.
+    """
+    combined = np.zeros(len(rows), dtype=np.int64)
+    for dim in dims:
+        # Mixed radix over (code + 1), so a missing label (-1) is a digit too
+        combined = combined * (len(labels.categories[dim]) + 1) + labels.codes[dim].take(rows) + 1
+    codes, _ = pd.factorize(combined, sort=True)
+    _, first = np.unique(codes, return_index=True)
+    return codes, first
+
+
+def _wide_layout(layout, columns_from, index_from, label_cols, fields=()):
+    """
+    Validate the layout arguments of `getTableData`.
+
+    Returns None for the tidy layout, else (columns_from, index_from) as lists:
+    the dimensions naming the series columns, and those kept as row keys
+    (default: every other selected dimension).
+    """
+    if layout == "tidy":
+        return None
+    if layout != "wide":
+        raise ValueError(f"Expected layout 'tidy' or 'wide' but received: '{layout}'")
+    if columns_from is None:
+        raise ValueError('layout="wide" requires columns_from=<dimension name(s)>')
+    if fields:
+        raise ValueError('fields= is only available with layout="tidy" (attributes are per datapoint)')
+
+    columns_from = [columns_from] if isinstance(columns_from, str) else list(columns_from)
+    if index_from is None:
+        index_from = [col for col in label_cols if col not in columns_from]
+    else:
+        index_from = [index_from] if isinstance(index_from, str) else list(index_from)
+    unknown = [dim for dim in columns_from + index_from if dim not in label_cols]
+    if unknown:
+        raise ValueError(f"Unknown dimension(s) {unknown}; expected some of {label_cols}")
+    return columns_from, index_from
+
+
+def _scatter_wide(rows, row_vector, ref_dates, values, labels, columns_from, index_from):
+    """
+    Scatter tidy points into a (row key x series) matrix without a groupby.
+
+    `rows` are the `labels` table rows of the vectors `row_vector` refers to.
+    Each vector's column is named by its `columns_from` labels joined with " ";
+    rows are keyed by its `index_from` labels plus REF_DATE. Column and row-group
+    codes are computed once per vector from the label codes, so the per-point work is one factorize of
+    the dates and a single fancy-indexed assignment. Like `pivot_table(aggfunc=
+    "first")` on the tidy frame, missing values are skipped, the first value wins
+    when several vectors share a cell, rows without any value are dropped, and
+    rows and columns are sorted by their labels' category order (rows then by date).
+
+    Returns
+    -------
+    (dict, numpy.ndarray, list[str], numpy.ndarray)
+        {index dim: (row_codes, categories)}, REF_DATE per row, the series
+        names, and the column-major (rows x series) value matrix; rows sorted by
+        row group, then date.
+    """
+    keep = ~np.isnan(values)
+    row_vector, ref_dates, values = row_vector[keep], np.asarray(ref_dates, dtype=object)[keep], values[keep]
+
+    # Per-vector codes: series column, and row group (index labels), both in
+    # category order; only the distinct label combinations are turned into names
+    column_codes, first = _combined_codes(labels, rows, columns_from)
+    names = np.array([" ".join(str(labels.label(d, rows[i])) for d in columns_from) for i in first], dtype=object)
+    name_codes, columns = pd.factorize(names)
+    vector_col = name_codes.take(column_codes)
+    vector_group, group_first = _combined_codes(labels, rows, index_from)
+
+    # Row = (group, date); YYYY-MM-DD strings sort chronologically
+    date_codes, dates = pd.factorize(ref_dates, sort=True)
+    row_ids, row_keys = pd.factorize(vector_group.take(row_vector) * len(dates) + date_codes, sort=True)
+
+    # Keep only the first point of each (row, series) cell, so the assignment
+    # has no repeated indices (NumPy does not define which write would win)
+    point_col = vector_col.take(row_vector)
+    first_points = np.flatnonzero(~pd.Series(row_ids * len(columns) + point_col).duplicated().to_numpy())
+    matrix = np.full((len(row_keys), len(columns)), np.nan, order="F")
+    matrix[row_ids.take(first_points), point_col.take(first_points)] = values.take(first_points)
+
+    row_group = row_keys // max(1, len(dates))
+    group_rows = np.asarray(rows).take(group_first)
+    label_columns = {
+        dim: (labels.codes[dim].take(group_rows).take(row_group), labels.categories[dim]) for dim in index_from
+    }
+    ref_dates = np.asarray(dates, dtype=object).take(row_keys % max(1, len(dates)))
+    return label_columns, ref_dates, list(columns), matrix
+
+
+def _incremental_json(setting):
+    """Validate an `incremental_json` client setting (True needs ijson)."""
+    if setting and ijson is None:
+        raise ImportError("incremental_json=True requires ijson; install it with `pip install ijson`.")
+    return bool(setting)
+
+
+def _spec_blocks(dims, block_size):
+    """
+    Split validated `dims` into consecutive sub-specs of about `block_size`
+    combinations each, by slicing the first (slowest-varying) dimension.
+    """
+    if not dims:
+        yield dims
+        return
+    (first, names), rest = dims[0], dims[1:]
+    step = max(1, block_size // max(1, int(np.prod([len(n) for _, n in rest], dtype=np.int64))))
+    for i in range(0, len(names), step):
+        yield [(first, names[i:i + step])] + rest
+
+
+def _did_you_mean(name, choices):
+    """' (did you mean ...?)' suffix for an unknown name, or ''."""
+    close = difflib.get_close_matches(str(name), list(choices), n=3)
+    return f" (did you mean {', '.join(repr(c) for c in close)}?)" if close else ""
+
+
+def _released_after(release, since):
+    """True if a WDS `releaseTime` string is later than naive Eastern `since`."""
+    try:
+        released_at = datetime.fromisoformat(release)
+    except (TypeError, ValueError):
+        return True  # unparseable releaseTime: be conservative and refetch
+    if released_at.tzinfo is not None:
+        released_at = released_at.astimezone(_WDS_TZ).replace(tzinfo=None)
+    return released_at > since
+
+
+class CubeSchema:
+    """
+    Indexed view of a cube's dimensions and members, built once per productId.
+
+    Attributes
+    ----------
+    pid : int
+        productId of the cube.
+    meta : dict
+        Raw WDS metadata object the schema was built from.
+    positions : dict
+        {dimensionNameEn: dimensionPositionId} (1-based slot in a coordinate).
+    members : dict
+        {dimensionNameEn: {memberNameEn: memberId}}
+    member_names : dict
+        {dimensionNameEn: {memberId: memberNameEn}}
+    """
+
+    def __init__(self, pid, meta):
+        self.pid = int(pid)
+        self.meta = meta
+        self.positions = {}
+        self.members = {}
+        self.member_names = {}
+        for dim in meta["dimension"]:
+            name = dim["dimensionNameEn"]
+            self.positions[name] = int(dim["dimensionPositionId"])
+            self.members[name] = {m["memberNameEn"]: m["memberId"] for m in dim["member"]}
+            self.member_names[name] = {m["memberId"]: m["memberNameEn"] for m in dim["member"]}
+
+    def __repr__(self):
+        return f"CubeSchema(pid={self.pid}, dimensions={list(self.positions)})"
+
+    def dimensions(self):
+        """Return the {dimName: {"position", "values": {memberName: memberId}}} mapping."""
+        return {
+            name: {"position": self.positions[name], "values": dict(self.members[name])}
+            for name in self.positions
+        }
+
+    @property
+    def n_series(self):
+        """Number of series in the cube (WDS `nbSeriesCube`, else the full member product)."""
+        n = self.meta.get("nbSeriesCube")
+        if n:
+            return int(n)
+        total = 1
+        for members in self.members.values():
+            total *= max(1, len(members))
+        return total
+
+    def validate_spec(self, series_specs):
+        """
+        Check a compact spec against the schema before anything is expanded.
+
+        Every entry must name exactly one dimension of this cube, at most once,
+        with members that exist in it. All problems are reported together in a
+        single ValueError (with close-match suggestions), instead of being skipped
+        combination by combination later.
+
+        Returns
+        -------
+        list[(str, list[str])]
+            (dimension, members) per entry, members deduplicated in order.
+        """
+        problems, dims, seen = [], [], set()
+        for entry in series_specs:
+            if not isinstance(entry, dict) or len(entry) != 1:
+                problems.append(f"each spec entry must be a one-key dict, got {entry!r}")
+                continue
+            (dim, value), = entry.items()
+            if dim not in self.members:
+                problems.append(f"unknown dimension '{dim}'{_did_you_mean(dim, self.members)}")
+                continue
+            if dim in seen:
+                problems.append(f"dimension '{dim}' is specified more than once")
+                continue
+            seen.add(dim)
+            names = list(dict.fromkeys(value if isinstance(value, (list, tuple)) else [value]))
+            if not names:
+                problems.append(f"no member selected for dimension '{dim}'")
+            for name in names:
+                if name not in self.members[dim]:
+                    problems.append(
+                        f"no member '{name}' in dimension '{dim}'{_did_you_mean(name, self.members[dim])}"
+                    )
+            dims.append((dim, names))
+        if problems:
+            raise ValueError(f"Invalid spec for cube {self.pid}:\n  - " + "\n  - ".join(problems))
+        return dims
+
+    def iter_coordinates(self, series_specs, block_size=_RESOLVE_CHUNK):
+        """
+        Lazily yield the coordinates of every combination selected by a compact spec.
+
+        The spec is validated up front (see `validate_spec`); combinations are then
+        produced in `expand_specs` order, rendered in vectorized blocks of about
+        `block_size` (see `coordinate_strings`), without building a dict per
+        combination. Specs with 10^5-10^6 combinations can be streamed into
+        resolution with bounded memory.
+        """
+        dims = self.validate_spec(series_specs)
+        for block in _spec_blocks(dims, block_size):
+            yield from self._render(block).tolist()
+
+    def coordinate_strings(self, series_specs):
+        """
+        Render all coordinates of a compact spec in bulk, in `expand_specs` order.
+
+        Each selected dimension contributes one array of pre-formatted memberId
+        fragments; the cartesian product is formed by broadcasting string
+        concatenation over those arrays, so the work is a few NumPy operations
+        rather than one interpreter-level join per combination.
+        """
+        return self._render(self.validate_spec(series_specs)).tolist()
+
+    def coordinate_matrix(self, series_specs):
+        """
+        Integer form of the spec's cartesian product, for use as compact keys.
+
+        Returns
+        -------
+        numpy.ndarray
+            (n_combinations, 10) int32 memberIds, one row per coordinate in
+            `expand_specs` order (0 in unselected slots). Rows line up with
+            `coordinate_strings`; `renderCoordinates` turns any row subset into
+            strings.
+        """
+        dims = self.validate_spec(series_specs)
+        ids = [np.array([self.members[dim][name] for name in names], dtype=np.int32) for dim, names in dims]
+        matrix = np.zeros((int(np.prod([len(a) for a in ids], dtype=np.int64)), 10), dtype=np.int32)
+        for (dim, _), grid in zip(dims, np.meshgrid(*ids, indexing="ij") if ids else []):
+            matrix[:, self.positions[dim] - 1] = grid.ravel()
+        return matrix
+
+    def _render(self, dims):
+        """Coordinate strings of validated `dims` ([(dimension, members)]) as a flat array."""
+        slot_of = {self.positions[dim] - 1: i for i, (dim, _) in enumerate(dims)}
+        result = np.asarray("", dtype=_STR_DTYPE)
+        axes, text = [], ""  # spec index of each result axis; pending constant text
+        for slot in range(10):  # WDS uses up to 10 non-time dimension slots; pad with '0'
+            sep = "." if slot else ""
+            i = slot_of.get(slot)
+            if i is None:
+                text += f"{sep}0"
+                continue
+            dim, names = dims[i]
+            fragments = np.array([f"{text}{sep}{self.members[dim][name]}" for name in names], dtype=_STR_DTYPE)
+            result = _str_add(result[..., None], fragments)  # one new axis per selected dimension
+            axes.append(i)
+            text = ""
+        result = np.asarray(_str_add(result, text), dtype=_STR_DTYPE)
+        # Axes follow coordinate slots; reorder them to spec order before flattening
+        return result.transpose([axes.index(i) for i in range(len(dims))]).ravel()
+
+    def coordinates(self, series_coords):
+        """
+        Map per-series dicts like {"Geography": "Canada", ...} to 10-part coordinates.
+
+        Series naming an unknown dimension or member are skipped with a warning.
+        See `buildCoordinates`.
+        """
+        coordinates = []
+        for series in series_coords:
+            coords = ["0"] * 10  # WDS uses up to 10 non-time dimension slots; pad with '0'
+            for k, v in series.items():
+                pos = self.positions.get(k)  # 1-based index
+                if pos is None:
+                    # Dimension name not found in this cube
+                    print(f"Warning: Could not locate dimension '{k}'")
+                    coords = None
+                    break
+                value = self.members[k].get(v)
+                if value is None:
+                    # Member name not found in this dimension
+                    print(f"Warning: No '{v}' found for the dimension '{k}'")
+                    coords = None
+                    break
+                coords[pos - 1] = str(value)  # place memberId in the correct slot
+            if coords:
+                coordinates.append(".".join(coords))
+        return coordinates
+
+
+class WDSClient:
+    """
+    Pooled, keep-alive HTTP client for the WDS REST API.
+
+    Every WDS call made through one client reuses the same `requests.Session`, so
+    consecutive requests to www150.statcan.gc.ca share TCP+TLS connections instead
+    of paying a fresh handshake each time.
+
+    Parameters
+    ----------
+    base_url : str or None
+        Root of the WDS REST API; defaults to `default_base_url()`.
+    pool_connections : int
+        Number of per-host connection pools to cache (one per distinct host).
+    pool_maxsize : int
+        Maximum number of keep-alive connections kept open per host.
+    timeout : float or (float, float)
+        Requests timeout: a single value, or a (connect, read) tuple in seconds.
+    max_retries : int
+        Connection-level retries performed by urllib3 (failed DNS lookups, refused
+        connections). HTTP error statuses are never retried here.
+    cache : bool
+        Keep cube metadata in an on-disk cache, revalidated against WDS
+        `getChangedCubeList` rather than refetched on every call, and keep
+        coordinate -> vectorId resolutions in a persistent SQLite cache.
+    cache_dir : str or Path or None
+        Cache location; defaults to `STATCAN_WDS_CACHE_DIR` or `~/.cache/statcan_wds`.
+    changed_list_ttl : float
+        Seconds for which today's (still growing) changed-cube list is reused
+        in-process before asking WDS again. Completed days are cached for good.
+    resolve_batch_size : int
+        Maximum number of coordinates sent in one `getSeriesInfoFromCubePidCoord`
+        request (WDS rejects oversized item lists).
+    max_workers : int
+        Size of the thread pool used to dispatch batches concurrently. Keep it at
+        or below `pool_maxsize` so every worker gets a keep-alive connection.
+    vectors_per_request : int
+        Maximum number of vectors per data request when sharding retrieval.
+    window_years : int or None
+        Width, in years, of the reference-period windows data retrieval is split
+        into. None fetches the whole range in one window.
+    requests_per_second : float or None
+        Sustained request rate enforced by a client-side token bucket shared by
+        every call (None disables it).
+    burst : int or None
+        Requests allowed back-to-back before the rate applies; defaults to
+        `requests_per_second`.
+    max_attempts : int
+        Total tries for a request answered with HTTP 429/503.
+    backoff_base, backoff_cap : float
+        Jittered exponential backoff between those tries, in seconds.
+    bulk_threshold : float
+        In `mode="auto"`, `get_table_data` switches to the full-table download
+        once the spec selects at least this fraction of the cube's series.
+    bulk_chunksize : int
+        Rows parsed per chunk when reading a full-table CSV.
+    json_loads : callable or None
+        Decoder applied to raw response bodies (bytes -> object). Defaults to
+        orjson when installed, else the stdlib `json`.
+    incremental_json : bool
+        Parse response bodies with ijson while they stream in, so a large body is
+        never buffered whole. Lowers peak memory on memory-constrained hosts, but
+        decodes several times slower than orjson (or even stdlib json); off by
+        default.
+    transfer_log_size : int
+        Number of recent per-call `Transfer` records kept in `transfers`.
+    on_event : callable or None
+        Instrumentation hook, called with an `Event` for every phase, request,
+        throttled answer and cache lookup (e.g. a `Metrics` instance). May be
+        replaced later through the `on_event` attribute or `instrument`.
+
+    Notes
+    -----
+    Concurrency adapts to the server: the number of requests in flight starts at
+    `max_workers`, halves on every 429/503, and grows back by one after a full
+    window of successful requests.
+
+    Every request asks for gzip/deflate. Bodies are decompressed as they stream
+    in, and each call appends a `Transfer(endpoint, wire_bytes, decoded_bytes,
+    encoding)` record to `transfers`; `transfer_totals()` sums them up.
+
+    Examples
+    --------
+    >>> with WDSClient(pool_maxsize=4) as client:
+    ...     meta = client.get_cube_metadata(18100006)
+    """
+
+    def __init__(self, base_url=None, pool_connections=4, pool_maxsize=10,
+                 timeout=(10, 120), max_retries=0, cache=True, cache_dir=None,
+                 changed_list_ttl=900, resolve_batch_size=300, max_workers=8,
+                 vectors_per_request=50, window_years=10, requests_per_second=10,
+                 burst=None, max_attempts=5, backoff_base=0.5, backoff_cap=30.0,
+                 bulk_threshold=0.5, bulk_chunksize=500_000, json_loads=None,
+                 incremental_json=False, transfer_log_size=1000, on_event=None):
+        self.base_url = (base_url or default_base_url()).rstrip("/")
+        self.timeout = timeout
+        self.metadata_cache = MetadataCache(cache_dir) if cache else None
+        self.vector_cache = VectorCache(cache_dir) if cache else None
+        self.changed_list_ttl = changed_list_ttl
+        self.resolve_batch_size = resolve_batch_size
+        self.max_workers = max_workers
+        self.vectors_per_request = vectors_per_request
+        self.window_years = window_years
+        self.rate_limiter = RateLimiter(requests_per_second, burst)
+        self.concurrency = AdaptiveConcurrency(max_workers, maximum=max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.bulk_threshold = bulk_threshold
+        self.bulk_chunksize = bulk_chunksize
+        self.json_loads = json_loads
+        self.incremental_json = _incremental_json(incremental_json)
+        self.transfers = deque(maxlen=transfer_log_size)
+        self._transfer_totals = {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0}
+        self.on_event = on_event
+        self._changed_today = {}  # {date: (checked_at, {pid: releaseTime})}
+        self._schemas = {}  # {pid: CubeSchema}, memoized for the client's lifetime
+        self._lock = threading.Lock()
+        self._schema_lock = threading.Lock()
+
+        # One adapter mounted on both schemes; each host gets its own pool of
+        # up to `pool_maxsize` persistent connections.
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """Close the underlying session and release pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- HTTP helpers -------------------------------------------------------
+
+    def _request(self, method, endpoint, payload=None):
+        """
+        Send one WDS request through the throttle and return the decoded response.
+
+        Every call takes a concurrency slot and a rate-limiter token first. HTTP
+        429/503 answers shrink the concurrency limit and are retried after a
+        jittered exponential delay, up to `max_attempts` tries in total.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_attempts):
+            self.concurrency.acquire()
+            try:
+                self.rate_limiter.acquire()
+                started = time.perf_counter()
+                # The body is streamed (and decoded) while the slot is still held
+                with self.session.request(method, url, json=payload, timeout=self.timeout, stream=True) as response:
+                    if response.status_code not in THROTTLE_STATUSES:
+                        response.raise_for_status()  # surface non-2xx HTTP errors immediately
+                        data = self._read_body(endpoint, response, started)
+            finally:
+                self.concurrency.release()
+
+            if response.status_code not in THROTTLE_STATUSES:
+                self.concurrency.on_success()
+                return data
+            self.concurrency.on_throttle()
+            self._emit("throttled", _endpoint_name(endpoint))
+            if attempt + 1 < self.max_attempts:
+                time.sleep(backoff_delay(
+                    attempt, self.backoff_base, self.backoff_cap,
+                    retry_after=response.headers.get("Retry-After"),
+                ))
+
+        response.raise_for_status()
+
+    def _read_body(self, endpoint, response, started):
+        """Decompress and decode a streamed response, logging its `Transfer`."""
+        chunks = response.raw.stream(CHUNK_SIZE, decode_content=True)
+        if self.on_event is None:
+            data, decoded = read_json(chunks, self.json_loads, self.incremental_json)
+        else:
+            # Decoding is whatever read_json spends outside of receiving chunks
+            waited = [0.0]
+            parsing = time.perf_counter()
+            data, decoded = read_json(_timed_chunks(chunks, waited), self.json_loads, self.incremental_json)
+            self._emit("phase", "decode", seconds=time.perf_counter() - parsing - waited[0])
+        transfer = Transfer(
+            endpoint.split("?", 1)[0],
+            response.raw.tell(),  # bytes pulled off the socket, before decompression
+            decoded,
+            response.headers.get("Content-Encoding"),
+        )
+        self._log_transfer(transfer)
+        self._emit("request", _endpoint_name(endpoint), seconds=time.perf_counter() - started,
+                   wire_bytes=transfer.wire_bytes, decoded_bytes=transfer.decoded_bytes)
+        return data
+
+    def _log_transfer(self, transfer):
+        self.transfers.append(transfer)
+        with self._lock:
+            self._transfer_totals["requests"] += 1
+            self._transfer_totals["wire_bytes"] += transfer.wire_bytes
+            self._transfer_totals["decoded_bytes"] += transfer.decoded_bytes
+
+    def transfer_totals(self):
+        """
+        Cumulative transfer statistics of this client.
+
+        Returns
+        -------
+        dict
+            requests, wire_bytes (compressed, as received), decoded_bytes
+            (decompressed JSON) and their ratio.
+        """
+        with self._lock:
+            totals = dict(self._transfer_totals)
+        totals["ratio"] = totals["decoded_bytes"] / totals["wire_bytes"] if totals["wire_bytes"] else None
+        return totals
+
+    # --- Instrumentation ----------------------------------------------------
+
+    def _emit(self, kind, name, pid=None, **values):
+        """Send an `Event` to `on_event`, if set."""
+        on_event = self.on_event
+        if on_event is not None:
+            on_event(Event(kind, name, pid, **values))
+
+    @contextmanager
+    def _phase(self, name, pid=None):
+        """Time the enclosed block as phase `name` (no clock reads without `on_event`)."""
+        if self.on_event is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._emit("phase", name, pid, seconds=time.perf_counter() - started)
+
+    def _cache_event(self, name, hit, pid=None, count=1):
+        if self.on_event is not None and count:
+            self._emit("cache_hit" if hit else "cache_miss", name, pid, count=count)
+
+    def _post(self, endpoint, payload):
+        """POST a JSON payload to `endpoint` and return the decoded response."""
+        return self._request("POST", endpoint, payload)
+
+    def _get(self, endpoint):
+        """GET `endpoint` (path + query string) and return the decoded response."""
+        return self._request("GET", endpoint)
+
+    def _map_concurrent(self, fn, tasks):
+        """
+        Apply `fn` to every task on a pool of up to `max_workers` threads.
+
+        Returns the results in task order, regardless of completion order.
+        """
+        if len(tasks) <= 1 or self.max_workers <= 1:
+            return [fn(t) for t in tasks]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as pool:
+            return list(pool.map(fn, tasks))
+
+    def _map_batches(self, fn, items, batch_size):
+        """
+        Apply `fn` to consecutive `batch_size` slices of `items` on the thread pool.
+
+        Returns the per-batch results in the original batch order.
+        """
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        return self._map_concurrent(fn, batches)
+
+    # --- WDS endpoints ------------------------------------------------------
+
+    def get_cube_metadata(self, pid):
+        """
+        Fetch cube (table) metadata for a given productId (PID).
+
+        With the metadata cache enabled, a cached entry is returned as long as the
+        cube does not appear in `getChangedCubeList` for any day since the entry
+        was last validated; otherwise the metadata is downloaded again. So is an
+        entry last validated more than `_MAX_CHANGED_LIST_DAYS` days ago.
+
+        Parameters
+        ----------
+        pid : int or str
+            StatCan productId (e.g., 18100006 for CPI 18-10-0006-01).
+
+        Returns
+        -------
+        dict
+            The "object" field from WDS metadata containing dimensions, members, etc.
+
+        Raises
+        ------
+        HTTPError
+            If HTTP status is not 2xx.
+        ValueError
+            If the payload structure is unexpected.
+        RuntimeError
+            If WDS returns non-SUCCESS at the item level.
+        """
+        if self.metadata_cache is None:
+            return self._fetch_cube_metadata(pid)
+
+        now = _wds_now()
+        entry = self.metadata_cache.load(pid)
+        checked = None
+        if entry is not None:
+            checked = self._unchanged_through(pid, entry["validated_at"], now, _MAX_CHANGED_LIST_DAYS)
+        if checked is not None:
+            self.metadata_cache.mark_validated(pid, entry, checked)
+            self._cache_event("metadata", True, pid)
+            return entry["object"]
+
+        self._cache_event("metadata", False, pid)
+        meta = self._fetch_cube_metadata(pid)
+        self.metadata_cache.store(pid, meta, now)
+        return meta
+
+    def _fetch_cube_metadata(self, pid):
+        """Download cube metadata from WDS, bypassing any cache."""
+        return _metadata_object(self._post("getCubeMetadata", [{"productId": pid}]))
+
+    def get_cube_schema(self, pid):
+        """
+        Return the memoized `CubeSchema` for `pid`, fetching metadata on first use.
+
+        All helpers (`previewDimensions`, `buildCoordinates`, `get_table_data`)
+        share this, so a process fetches each cube's metadata at most once per client.
+        """
+        pid = int(pid)
+        schema = self._schemas.get(pid)
+        if schema is None:
+            # Serialize first fetches so concurrent callers don't race to download
+            with self._schema_lock:
+                schema = self._schemas.get(pid)
+                if schema is None:
+                    self._cache_event("schema", False, pid)
+                    with self._phase("metadata", pid):
+                        schema = CubeSchema(pid, self.get_cube_metadata(pid))
+                    self._schemas[pid] = schema
+                    return schema
+        self._cache_event("schema", True, pid)
+        return schema
+
+    def get_changed_cubes(self, day, refresh=False):
+        """
+        Return {productId: releaseTime} for cubes WDS republished on `day`.
+
+        Completed days are read from / written to the on-disk cache; the current
+        day is reused in-process for `changed_list_ttl` seconds, unless `refresh`.
+        `day` may be a date, a YYYY-MM-DD string or a timestamp (see `_to_wds_time`).
+        """
+        return self._changed_list(day, refresh)[0]
+
+    def _changed_list(self, day, refresh=False):
+        """
+        `get_changed_cubes(day)` plus the time the list is complete up to.
+
+        Returns (changed, as_of): as_of is None for a completed day (its list is
+        final) and the time the list was fetched for the current day, which may
+        lag the clock by up to `changed_list_ttl`.
+        """
+        day = _to_wds_time(day).date()
+        today = _wds_now().date()
+
+        if day < today and self.metadata_cache is not None:
+            changed = self.metadata_cache.load_changed(day)
+            if changed is not None:
+                self._cache_event("changed_cubes", True)
+                return changed, None
+        elif day == today and not refresh:
+            with self._lock:
+                hit = self._changed_today.get(day)
+            if hit is not None and (_wds_now() - hit[0]).total_seconds() < self.changed_list_ttl:
+                self._cache_event("changed_cubes", True)
+                return hit[1], hit[0]
+
+        self._cache_event("changed_cubes", False)
+        checked_at = _wds_now()
+        changed = _changed_cubes(self._get(f"getChangedCubeList/{day.isoformat()}"))
+
+        if day < today and self.metadata_cache is not None:
+            self.metadata_cache.store_changed(day, changed)
+        elif day == today:
+            with self._lock:
+                self._changed_today = {day: (checked_at, changed)}
+        return changed, (None if day < today else checked_at)
+
+    def _unchanged_through(self, pid, since, now, max_days=None):
+        """
+        Check day by day up to `now` whether cube `pid` was released after `since`.
+
+        Returns None if it was (or if `since` is more than `max_days` days back,
+        which is not walked), else the time the check is good for: `now`, or the
+        fetch time of a reused changed-cube list for today if earlier, so a
+        release published after that fetch is still caught next time.
+        """
+        pid = int(pid)
+        if max_days is not None and (now.date() - since.date()).days > max_days:
+            return None
+        day, checked = since.date(), now
+        while day <= now.date():
+            changed, as_of = self._changed_list(day)
+            release = changed.get(pid)
+            # A release on the watermark day only counts if it came after it
+            if release is not None and (day > since.date() or _released_after(release, since)):
+                return None
+            if as_of is not None:
+                checked = min(checked, as_of)
+            day += timedelta(days=1)
+        return checked
+
+    def cube_releases_since(self, pid, since):
+        """
+        List the days on which cube `pid` was republished after `since`.
+
+        Costs one `getChangedCubeList` request per day not yet cached.
+
+        Parameters
+        ----------
+        pid : int or str
+            productId of the cube.
+        since : datetime or str
+            Watermark; naive values are taken as Eastern time (the WDS clock).
+
+        Returns
+        -------
+        list[datetime.date]
+            Release days in chronological order (empty when nothing changed).
+        """
+        pid = int(pid)
+        since = _to_wds_time(since)
+        day, today = since.date(), _wds_now().date()
+        releases = []
+        while day <= today:
+            release = self.get_changed_cubes(day).get(pid)
+            if release is not None and (day > since.date() or _released_after(release, since)):
+                releases.append(day)
+            day += timedelta(days=1)
+        return releases
+
+    def resolve_coordinates(self, pid, coords):
+        """
+        Resolve coordinates to (vectorId, SeriesTitleEn), consulting the vector cache.
+
+        Cached coordinates are answered locally; the remaining ones are split into
+        batches of at most `resolve_batch_size`, sent to `getSeriesInfoFromCubePidCoord`
+        concurrently (up to `max_workers` in flight), and the valid answers are
+        added to the cache.
+
+        `coords` may be any iterable, e.g. the lazy `CubeSchema.iter_coordinates`;
+        it is consumed `_RESOLVE_CHUNK` coordinates at a time, so only the valid
+        resolutions are kept in memory, never the full list of candidates.
+
+        Returns
+        -------
+        dict
+            {coordinate: (vectorId, title)} in the order of `coords`, for valid
+            coordinates only (WDS answers vectorId=0 for invalid ones).
+        """
+        def resolve_batch(batch):
+            return _series_info(batch, self._post(
+                "getSeriesInfoFromCubePidCoord",
+                [{"productId": pid, "coordinate": c} for c in batch],
+            ))
+
+        result = {}
+        coords = iter(coords)
+        while True:
+            raw = list(islice(coords, _RESOLVE_CHUNK))
+            if not raw:
+                break
+            chunk = [c for c in dict.fromkeys(raw) if c not in result]  # dedupe, keep order
+            known = self.vector_cache.lookup(pid, chunk) if self.vector_cache is not None else {}
+
+            missing = [c for c in chunk if c not in known]
+            if self.vector_cache is not None:
+                self._cache_event("vectors", True, pid, count=len(chunk) - len(missing))
+                self._cache_event("vectors", False, pid, count=len(missing))
+            if missing:
+                resolved = {}
+                for part in self._map_batches(resolve_batch, missing, self.resolve_batch_size):
+                    resolved.update(part)
+                if self.vector_cache is not None:
+                    self.vector_cache.store(pid, resolved)
+                known.update(resolved)
+
+            result.update((c, known[c]) for c in chunk if c in known)
+        return result
+
+    def get_vector_ids(self, pid, coords):
+        """Resolve coordinates to {vectorId: SeriesTitleEn}. See `getVectorIds`."""
+        if isinstance(coords, (list, tuple)) and len(coords) == 0:
+            raise Exception("Invalid coordinates. Please specify all required dimensions")
+
+        # Build {vectorId: title}
+        return dict(_check_resolved(self.resolve_coordinates(pid, coords), coords).values())
+
+    def get_vector_data(self, vector_ids, startRefPeriod, endRefPeriod):
+        """
+        Fetch raw datapoints for `vector_ids` over a reference-period range.
+
+        Returns the list of per-vector WDS items, each holding an "object" with
+        "vectorId" and "vectorDataPoint".
+        """
+        # Build a CSV of quoted vectorIds per current API style
+        vectorIds = ",".join([f'"{v}"' for v in vector_ids])
+        return self._get(
+            "getDataFromVectorByReferencePeriodRange"
+            f"?vectorIds={vectorIds}&startRefPeriod={startRefPeriod}&endReferencePeriod={endRefPeriod}"
+        )
+
+    def _data_shards(self, vector_ids, startRefPeriod, endRefPeriod):
+        """
+        Split a download into (vector_group, start, end) shards.
+
+        Groups hold at most `vectors_per_request` vectors and windows span at most
+        `window_years` years. Shards are ordered by group, then chronologically.
+        """
+        vector_ids = list(vector_ids)
+        step = self.vectors_per_request or len(vector_ids) or 1
+        groups = [vector_ids[i:i + step] for i in range(0, len(vector_ids), step)]
+        windows = _refperiod_windows(startRefPeriod, endRefPeriod, self.window_years)
+        return [(group, start, end) for group in groups for start, end in windows]
+
+    def fetch_vector_data(self, vector_ids, startRefPeriod, endRefPeriod):
+        """
+        Sharded, concurrent retrieval of datapoints for many vectors.
+
+        The work is split into shards of at most `vectors_per_request` vectors by
+        `window_years`-wide reference-period windows, and the shards are fetched
+        on the thread pool.
+
+        Returns
+        -------
+        dict
+            {vectorId: [datapoint, ...]} in the order of `vector_ids`, each list in
+            chronological window order.
+        """
+        vector_ids = list(vector_ids)
+        shards = self._data_shards(vector_ids, startRefPeriod, endRefPeriod)
+        results = self._map_concurrent(lambda shard: self.get_vector_data(*shard), shards)
+
+        # Stitch: shards are ordered (group, window), so appending per vector in
+        # shard order keeps every series chronological.
+        points = {v: [] for v in vector_ids}
+        for items in results:
+            for vId, pts in _shard_points(items).items():
+                points[vId].extend(pts)
+        return points
+
+    def _resolve_series(self, pid, series_specs):
+        """
+        Turn `series_specs` into the vectors to fetch and their dimension labels.
+
+        Returns
+        -------
+        (list[int], LabelTable)
+            vector IDs and their dimension labels.
+        """
+        # 1) Validate the spec against the cube schema, then stream the
+        #    coordinates of its cartesian product (no per-series dicts)
+        schema = self.get_cube_schema(pid)
+        with self._phase("resolve", pid):
+            coords = schema.iter_coordinates(series_specs)
+
+            # 2) Resolve coordinates to vector IDs, chunk by chunk, and label each
+            #    vector from its coordinate's memberIds
+            resolved = _check_resolved(self.resolve_coordinates(pid, coords), coords)
+            return _series_labels(series_specs, schema, resolved)
+
+    def get_table_data(self, pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                       mode="auto", backend="pandas", layout="tidy", columns_from=None, index_from=None,
+                       fields=None, apply_scalar_factor=False):
+        """Fetch a tidy (or wide) DataFrame for `series_specs`. See `getTableData`."""
+        check_backend(backend)
+        fields = check_fields(fields)
+        if mode == "auto":
+            # The full-table CSV only carries some attributes
+            bulk_ok = all(f in BULK_FIELDS for f in fields)
+            mode = self.choose_mode(pid, series_specs) if bulk_ok else "vector"
+        if mode == "bulk":
+            return self.get_bulk_table_data(pid, series_specs, startRefPeriod, endRefPeriod, backend,
+                                            layout, columns_from, index_from, fields, apply_scalar_factor)
+        if mode != "vector":
+            raise ValueError(f"Expected mode 'auto', 'vector' or 'bulk' but received: '{mode}'")
+
+        vector_ids, labels = self._resolve_series(pid, series_specs)
+        wide = _wide_layout(layout, columns_from, index_from, labels.columns, fields)
+
+        # 4) Fetch all vectors across the requested reference-period range
+        #    (sharded by vector group x period window, fetched concurrently)
+        with self._phase("download", pid):
+            series = self.fetch_vector_data(vector_ids, startRefPeriod, endRefPeriod)
+
+        # 5) Assemble the frame in a single pass
+        with self._phase("assemble", pid):
+            return _assemble_frame(series, labels, backend, wide, fields, apply_scalar_factor)
+
+    def choose_mode(self, pid, series_specs):
+        """
+        Crossover rule between per-vector retrieval and the full-table download.
+
+        Returns "bulk" when the spec selects at least `bulk_threshold` of the
+        cube's series (one CSV download then beats resolving and fetching that
+        many vectors), otherwise "vector".
+        """
+        schema = self.get_cube_schema(pid)
+        fraction = _spec_size(series_specs) / max(1, schema.n_series)
+        return "bulk" if fraction >= self.bulk_threshold else "vector"
+
+    def download_full_table(self, pid, path):
+        """
+        Stream the zipped full-table CSV of `pid` to `path`.
+
+        Asks `getFullTableDownloadCSV` for the download URL, then writes the
+        archive in 1 MiB chunks (never holding it in memory).
+        """
+        data = self._get(f"getFullTableDownloadCSV/{int(pid)}/en")
+        if not isinstance(data, dict) or data.get("status") != "SUCCESS":
+            raise RuntimeError(f"WDS error: {data}")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        self.concurrency.acquire()
+        try:
+            self.rate_limiter.acquire()
+            started = time.perf_counter()
+            with self.session.get(data["object"], stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for block in response.iter_content(chunk_size=1 << 20):
+                        f.write(block)
+                    size = f.tell()
+        finally:
+            self.concurrency.release()
+        self._emit("request", "fullTableZip", int(pid), seconds=time.perf_counter() - started,
+                   wire_bytes=size, decoded_bytes=size)
+        os.replace(tmp, path)
+        return path
+
+    def get_bulk_table_data(self, pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                            backend="pandas", layout="tidy", columns_from=None, index_from=None,
+                            fields=None, apply_scalar_factor=False):
+        """
+        Build the `getTableData` frame from the cube's full-table CSV.
+
+        No coordinate resolution or per-vector requests are made: rows are
+        filtered by the selected coordinates (memberIds) while the CSV is parsed
+        in chunks, and labels come from the cube schema. With the cache enabled,
+        the zip is kept and reused until the cube is republished.
+
+        Of the optional `fields`, only those the CSV carries (`BULK_FIELDS`:
+        decimals, scalarFactorCode) are available.
+        """
+        fields = check_fields(fields)
+        unsupported = [f for f in fields if f not in BULK_FIELDS]
+        if unsupported:
+            raise ValueError(f'Field(s) {unsupported} are not in the full-table CSV; use mode="vector"')
+        wanted = fetched_fields(fields, apply_scalar_factor)
+        schema = self.get_cube_schema(pid)
+        coords = schema.iter_coordinates(series_specs)
+        n_dims = len(schema.positions)
+        short = list(dict.fromkeys(short_coordinate(c, n_dims) for c in coords))
+
+        index_cols = _index_columns(series_specs, schema.positions)
+        label_cols = [col for col in index_cols if col in schema.positions]
+        labels = LabelTable.from_coordinates(schema, range(len(short)), short, label_cols)
+        wide = _wide_layout(layout, columns_from, index_from, label_cols, fields)
+
+        if self.metadata_cache is not None:
+            path = self.metadata_cache.bulk_path(pid)
+            now = _wds_now()
+            fetched_at = self.metadata_cache.load_bulk_stamp(pid)
+            stale = fetched_at is None or self._unchanged_through(pid, fetched_at, now) is None
+            self._cache_event("bulk", not stale, pid)
+            if stale:
+                with self._phase("download", pid):
+                    self.download_full_table(pid, path)
+                self.metadata_cache.store_bulk_stamp(pid, now)
+            with self._phase("bulk_parse", pid):
+                positions, _, ref_dates, values, attributes, matched = read_bulk_csv(
+                    path, pid, short, startRefPeriod, endRefPeriod, self.bulk_chunksize, wanted
+                )
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                with self._phase("download", pid):
+                    path = self.download_full_table(pid, Path(tmp) / f"{int(pid)}-eng.zip")
+                with self._phase("bulk_parse", pid):
+                    positions, _, ref_dates, values, attributes, matched = read_bulk_csv(
+                        path, pid, short, startRefPeriod, endRefPeriod, self.bulk_chunksize, wanted
+                    )
+
+        # As in vector mode, a selection no series matches is an error, not an empty frame
+        _check_resolved([c for c, m in zip(short, matched) if m], short)
+
+        with self._phase("assemble", pid):
+            return _frame_from_arrays(labels.keys, positions, ref_dates, values, labels, backend, wide,
+                                      attributes, fields, apply_scalar_factor)
+
+    def get_changed_vector_data(self, vector_ids):
+        """
+        Fetch the datapoints added or revised at the latest release of each vector.
+
+        Wraps `getChangedSeriesDataFromVector`, batched like coordinate resolution.
+        Vectors that did not change at that release are simply absent.
+
+        Returns
+        -------
+        dict
+            {vectorId: [datapoint, ...]}
+        """
+        def changed_batch(batch):
+            items = self._post("getChangedSeriesDataFromVector", [{"vectorId": v} for v in batch])
+            # Non-SUCCESS items here are vectors that did not change at that release
+            return _shard_points([i for i in items if i.get("status") == "SUCCESS"])
+
+        points = {}
+        for part in self._map_batches(changed_batch, list(vector_ids), self.resolve_batch_size):
+            points.update(part)
+        return points
+
+    def get_vector_data_by_release(self, vector_ids, startReleaseTime, endReleaseTime=None):
+        """
+        Fetch the datapoints of `vector_ids` released within a time window.
+
+        Wraps `getBulkVectorDataByRange`, sharded by `vectors_per_request` and
+        fetched concurrently. Unlike a reference-period query, this returns
+        revisions to old periods as well as new periods, but only those
+        published in [startReleaseTime, endReleaseTime].
+
+        Parameters
+        ----------
+        vector_ids : iterable of int
+        startReleaseTime, endReleaseTime : datetime or str
+            Release window; naive values are Eastern time (the WDS clock).
+            `endReleaseTime` defaults to now.
+
+        Returns
+        -------
+        dict
+            {vectorId: [datapoint, ...]} in the order of `vector_ids`.
+
+        Raises
+        ------
+        RuntimeError
+            If WDS returns non-SUCCESS for any vector.
+        """
+        start = _to_wds_time(startReleaseTime).strftime("%Y-%m-%dT%H:%M")
+        end = _to_wds_time(endReleaseTime if endReleaseTime is not None else _wds_now()).strftime("%Y-%m-%dT%H:%M")
+
+        def release_batch(batch):
+            return _shard_points(self._post("getBulkVectorDataByRange", {
+                "vectorIds": [str(v) for v in batch],
+                "startDataPointReleaseDate": start,
+                "endDataPointReleaseDate": end,
+            }))
+
+        vector_ids = list(vector_ids)
+        points = {v: [] for v in vector_ids}
+        step = self.vectors_per_request or len(vector_ids) or 1
+        for part in self._map_batches(release_batch, vector_ids, step):
+            for vId, pts in part.items():
+                points[vId].extend(pts)
+        return points
+
+    def get_released_table_data(self, pid, series_specs, startReleaseTime, endReleaseTime=None,
+                                fields=None, apply_scalar_factor=False):
+        """Tidy frame of the points released in a time window. See `getReleasedTableData`."""
+        fields = check_fields(fields)
+        vector_ids, labels = self._resolve_series(pid, series_specs)
+        with self._phase("download", pid):
+            series = self.get_vector_data_by_release(vector_ids, startReleaseTime, endReleaseTime)
+        with self._phase("assemble", pid):
+            return _assemble_frame(series, labels, fields=fields, apply_scalar_factor=apply_scalar_factor)
+
+    def get_changed_table_data(self, pid, series_specs, since,
+                               startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                               fields=None, apply_scalar_factor=False):
+        """Fetch only what changed since a watermark. See `getChangedTableData`."""
+        fields = check_fields(fields)
+        schema = self.get_cube_schema(pid)
+        since = _to_wds_time(since)
+        if (_wds_now().date() - since.date()).days > _MAX_CHANGED_LIST_DAYS:
+            releases = None  # too far back to walk the lists; take everything released since
+        else:
+            releases = self.cube_releases_since(pid, since)
+
+        if releases == []:
+            # Quiet cube: nothing to download beyond the (cached) changed-cube lists
+            label_cols = [c for c in _index_columns(series_specs, schema.positions) if c in schema.positions]
+            return _assemble_frame({}, LabelTable.from_dict({}, label_cols), fields=fields,
+                                   apply_scalar_factor=apply_scalar_factor)
+
+        vector_ids, labels = self._resolve_series(pid, series_specs)
+        with self._phase("download", pid):
+            if releases is not None and len(releases) == 1:
+                # A single release since the watermark is exactly what the
+                # changed-series endpoint reports: only the new/revised points.
+                series = self.get_changed_vector_data(vector_ids)
+            else:
+                # Several releases: the changed-series endpoint only sees the latest
+                # one, so ask for everything released since the watermark instead.
+                series = self.get_vector_data_by_release(vector_ids, since)
+
+        start, end = str(startRefPeriod)[:10], str(endRefPeriod)[:10]
+        series = {
+            v: [pt for pt in series.get(v, []) if start <= pt["refPer"][:10] <= end]
+            for v in vector_ids
+        }
+        with self._phase("assemble", pid):
+            return _assemble_frame(series, labels, fields=fields, apply_scalar_factor=apply_scalar_factor)
+
+    def iter_table_data(self, pid, series_specs, startRefPeriod="2000-01-01",
+                        endRefPeriod="2025-12-31", ordered=False, backend="pandas",
+                        fields=None, apply_scalar_factor=False):
+        """Stream tidy frames shard by shard. See `iterTableData`."""
+        check_backend(backend)
+        fields = check_fields(fields)
+        vector_ids, labels = self._resolve_series(pid, series_specs)
+        shards = self._data_shards(vector_ids, startRefPeriod, endRefPeriod)
+        return TableDataStream(self, shards, labels, ordered=ordered, backend=backend, fields=fields,
+                               apply_scalar_factor=apply_scalar_factor)
+
+
+def _endpoint_name(endpoint):
+    """WDS method of `endpoint`, without path arguments or query string (event names)."""
+    return endpoint.split("?", 1)[0].split("/", 1)[0]
+
+
+def _timed_chunks(chunks, waited):
+    """Yield from `chunks`, adding the time spent waiting for each to `waited[0]`."""
+    chunks = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        chunk = next(chunks, None)
+        waited[0] += time.perf_counter() - started
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _shard_points(items):
+    """
+    Map one data response (list of WDS items) to {vectorId: [datapoint, ...]}.
+
+    Raises RuntimeError on an item WDS did not answer with SUCCESS (its
+    "object" is then a message, not a series).
+    """
+    points = {}
+    for item in items:
+        if item.get("status") != "SUCCESS":
+            raise RuntimeError(f"WDS error: {item.get('status')} | {item.get('object')}")
+        obj = item["object"]
+        points.setdefault(obj["vectorId"], []).extend(obj.get("vectorDataPoint") or [])
+    return points
+
+
+class TableDataStream:
+    """
+    Iterable of tidy DataFrames, one per retrieval shard (vector group x period window).
+
+    Created by `iterTableData` / `WDSClient.iter_table_data`. Coordinates are
+    resolved up front, so `labels` is available before any data is downloaded;
+    iterating then fetches shards on the client's thread pool, keeping at most
+    `max_workers` shards in flight, and yields each frame as soon as its shard
+    arrives. Peak memory is bounded by the in-flight shards, not the full result.
+
+    Attributes
+    ----------
+    labels : pandas.DataFrame
+        One row per vector (index: vectorId) with its dimension labels (Categorical).
+    label_cols : list[str]
+        Dimension columns present in every yielded frame, before REF_DATE/VALUE.
+    shards : list[tuple]
+        (vector_ids, startRefPeriod, endRefPeriod) for every request to be made.
+    ordered : bool
+        Yield frames in shard order (group, then window) instead of arrival order.
+    backend : str
+        Type of the yielded frames: "pandas", "arrow" or "polars".
+    fields : tuple[str]
+        Datapoint attributes added to every frame (see `getTableData`).
+    apply_scalar_factor : bool
+        Whether VALUE is scaled by 10**scalarFactorCode.
+    """
+
+    def __init__(self, client, shards, labels, ordered=False, backend="pandas", fields=(),
+                 apply_scalar_factor=False):
+        self.client = client
+        self.shards = shards
+        self.label_cols = labels.columns
+        self.ordered = ordered
+        self.backend = backend
+        self.fields = check_fields(fields)
+        self.apply_scalar_factor = apply_scalar_factor
+        self._labels = labels
+        self.labels = labels.to_frame()
+
+    def __len__(self):
+        return len(self.shards)
+
+    def _fetch(self, shard):
+        with self.client._phase("download"):
+            points = _shard_points(self.client.get_vector_data(*shard))
+        with self.client._phase("assemble"):
+            return _assemble_frame(points, self._labels, self.backend, fields=self.fields,
+                                   apply_scalar_factor=self.apply_scalar_factor)
+
+    def __iter__(self):
+        shards = iter(self.shards)
+        workers = max(1, self.client.max_workers)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending = deque(pool.submit(self._fetch, sh) for sh in islice(shards, workers))
+            while pending:
+                if self.ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+                frame = future.result()
+                # Refill the pool before handing the frame to the consumer
+                for sh in islice(shards, 1):
+                    pending.append(pool.submit(self._fetch, sh))
+                if len(frame):
+                    yield frame
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Return the process-wide `WDSClient`, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = WDSClient()
+        return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the process-wide `WDSClient` used by the module-level functions.
+
+    Returns the previous default client (or None) so callers can restore it.
+    """
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    return previous
+
+
+@contextmanager
+def instrument(callback, client=None):
+    """
+    Send the instrumentation events of `client` to `callback` within a block.
+
+    Sets `client.on_event` (default client if None) and restores the previous
+    hook on exit, so callers can attribute events to the work done in the block.
+
+    Examples
+    --------
+    >>> metrics = Metrics()
+    >>> with instrument(metrics):
+    ...     df = getTableData(18100006, specs)
+    >>> metrics.summary()["requests"]["wire_bytes"]
+    """
+    client = client or get_default_client()
+    previous, client.on_event = client.on_event, callback
+    try:
+        yield client
+    finally:
+        client.on_event = previous
+
+
+def getCubeMetadata(pid, client=None):
     """
     Fetch cube (table) metadata for a given productId (PID).
 
+    Thin wrapper over `WDSClient.get_cube_metadata` using `client` or the default
+    client.
+
     Parameters
     ----------
     pid : int or str
         StatCan productId (e.g., 18100006 for CPI 18-10-0006-01).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
     Returns
     -------
     dict
         The "object" field from WDS metadata containing dimensions, members, etc.
+    """
+    return (client or get_default_client()).get_cube_metadata(pid)
 
-    Raises
-    ------
-    HTTPError
-        If HTTP status is not 2xx.
-    ValueError
-        If the payload structure is unexpected.
-    RuntimeError
-        If WDS returns non-SUCCESS at the item level.
+
+def getCubeSchema(pid, client=None):
     """
-    url = f"{BASE}/getCubeMetadata"
-    payload = [{"productId": pid}]
-    response = requests.post(url, json=payload)
-    response.raise_for_status()  # surface non-2xx HTTP errors immediately
+    Return the shared, memoized `CubeSchema` for a cube.
 
-    data = response.json()
-    if not isinstance(data, list) or not data:
-        raise ValueError(f"Unexpected payload: {data}")
+    Parameters
+    ----------
+    pid : int or str
+        productId of the table.
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
-    item = data[0]
-    if item.get("status") != "SUCCESS":
-        # WDS-level error even though HTTP was 200
-        raise RuntimeError(f"WDS error: {item.get('status')} | {item.get('object')}")
-    return item["object"]
+    Returns
+    -------
+    CubeSchema
+    """
+    return (client or get_default_client()).get_cube_schema(pid)
 
 
-def previewDimensions(pid, target="names", dimName=None):
+def getChangedCubeList(day, client=None, refresh=False):
+    """
+    List the cubes WDS republished on a given day.
+
+    Parameters
+    ----------
+    day : str or datetime.date or datetime.datetime
+        Release day (YYYY-MM-DD). A timestamp stands for its day on the WDS
+        (Eastern) clock; aware values are converted.
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+    refresh : bool
+        Ask WDS again for the current day's list even if the client fetched it
+        less than `changed_list_ttl` seconds ago.
+
+    Returns
+    -------
+    dict
+        {productId: releaseTime}
+    """
+    return (client or get_default_client()).get_changed_cubes(day, refresh)
+
+
+def previewDimensions(pid, target="names", dimName=None, client=None):
     """
     Quick console preview of a cube's dimensions.
 
@@ -76,21 +1805,15 @@ def previewDimensions(pid, target="names", dimName=None):
         - "full": prints full nested mapping {dimName: {position, values{...}}}
     dimName : str or None
         Required when target="values"; the English dimension name to inspect.
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
     Notes
     -----
     This function prints for exploration; it does not return data structures.
     """
-    meta = getCubeMetadata(pid)
-
-    # Build a mapping from dimension English name -> position + {memberName: memberId}
-    dimensions = {
-        dim["dimensionNameEn"]: {
-            "position": dim["dimensionPositionId"],
-            "values": {m["memberNameEn"]: m["memberId"] for m in dim["member"]},
-        }
-        for dim in meta["dimension"]
-    }
+    schema = getCubeSchema(pid, client=client)
+    dimensions = schema.dimensions()
 
     if target == "full":
         return dimensions
@@ -105,7 +1828,7 @@ def previewDimensions(pid, target="names", dimName=None):
                 return dim["values"]
 
 
-def buildCoordinates(pid, series_coords):
+def buildCoordinates(pid, series_coords, client=None):
     """
     Map human-readable series specs to WDS coordinates.
 
@@ -116,6 +1839,8 @@ def buildCoordinates(pid, series_coords):
     series_coords : list[dict]
         Each dict selects exactly one member (by *English name*) per dimension you care about.
         Example item: {"Geography": "Canada", "Trade": "Imports", ...}
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
     Returns
     -------
@@ -129,42 +1854,101 @@ def buildCoordinates(pid, series_coords):
       If the cube requires a specific member (i.e., no valid 'All/Total'), you will
       later get vectorId=0 from WDS for that coordinate.
     """
-    # Get table metadata (dimensions + members)
-    meta = getCubeMetadata(pid)
-
-    # Build dimension mapping: {dimName -> {position, values{name -> id}}}
-    dim_mapping = {
-        dim["dimensionNameEn"]: {
-            "position": dim["dimensionPositionId"],
-            "values": {m["memberNameEn"]: m["memberId"] for m in dim["member"]},
-        }
-        for dim in meta["dimension"]
-    }
+    # Shared schema: {dimName -> position} and {dimName -> {memberName -> memberId}}
+    schema = getCubeSchema(pid, client=client)
 
-    # Map a dict like {"Geography":"Canada", ...} to a 10-part coordinate string
-    coordinates = []
-    for series in series_coords:
-        coords = ["0"] * 10  # WDS uses up to 10 non-time dimension slots; pad with '0'
-        for k, v in series.items():
-            dim = dim_mapping.get(k)
-            if dim is None:
-                # Dimension name not found in this cube
-                print(f"Warning: Could not locate dimension '{k}'")
-                coords = None
-                break
-            pos = dim["position"]  # 1-based index
-            value = dim["values"].get(v)
-            if value is None:
-                # Member name not found in this dimension
-                print(f"Warning: No '{v}' found for the dimension '{k}'")
-                coords = None
-                break
-            coords[int(pos) - 1] = str(value)  # place memberId in the correct slot
-        if coords:
-            coordinates.append(".".join(coords))
+    coordinates = schema.coordinates(series_coords)
 
     # dim_map helps later to order index columns by the cube's dimension positions
-    return coordinates, {dim: int(v["position"]) for dim, v in dim_mapping.items()}
+    return coordinates, dict(schema.positions)
+
+
+def renderCoordinates(matrix):
+    """
+    Render integer coordinates to coordinate strings, column by column.
+
+    Parameters
+    ----------
+    matrix : array-like
+        (n, 10) memberIds, e.g. rows of `CubeSchema.coordinate_matrix`.
+
+    Returns
+    -------
+    list[str]
+        One 10-slot coordinate per row ("1.2.0.0.0.0.0.0.0.0").
+    """
+    matrix = np.asarray(matrix)
+    if not len(matrix):
+        return []
+    low, high = matrix.min(axis=0).tolist(), matrix.max(axis=0).tolist()
+    # Each varying column is rendered once per memberId (they are small, dense
+    # ints) and gathered; constant columns, such as unselected slots, are folded
+    # into the next fragments instead of being appended row by row
+    out, text = None, ""
+    for k in range(matrix.shape[1]):
+        text += "." if k else ""
+        if low[k] == high[k]:
+            text += str(low[k])
+            continue
+        fragments = np.array([f"{text}{v}" for v in range(low[k], high[k] + 1)], dtype=object)
+        part = fragments.take(matrix[:, k] - low[k])
+        out, text = (part if out is None else out + part), ""
+    if out is None:
+        return [text] * len(matrix)
+    return (out + text if text else out).tolist()
+
+
+def iterCoordinates(pid, series_specs, client=None):
+    """
+    Validate a compact spec against the cube schema and stream its coordinates.
+
+    Parameters
+    ----------
+    pid : int or str
+        productId of the table.
+    series_specs : list[dict]
+        Compact specification (same as `getTableData`).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+
+    Returns
+    -------
+    generator of str
+        10-slot coordinates, one per combination, in `expand_specs` order.
+
+    Raises
+    ------
+    ValueError
+        Immediately, before anything is expanded, if the spec names an unknown
+        dimension or member (all problems are listed at once).
+
+    Examples
+    --------
+    >>> coords = iterCoordinates(18100004, [{"Geography": all_geos}, {"Products and product groups": all_products}])
+    >>> vectors = getVectorIds(18100004, coords)   # resolved chunk by chunk
+    """
+    schema = getCubeSchema(pid, client=client)
+    dims = schema.validate_spec(series_specs)  # eager: errors surface here, not on first next()
+    return schema.iter_coordinates([{dim: names} for dim, names in dims])
+
+
+def iter_specs(series_spec):
+    """
+    Lazily expand a compact spec: yield one {dimension: member} dict per combination.
+
+    Same order as `expand_specs`, without materializing the product. For
+    coordinates, prefer `CubeSchema.iter_coordinates`, which also validates the
+    spec and skips the per-combination dicts altogether.
+    """
+    pairs = []
+    for dim in series_spec:
+        (k, v), = dim.items()
+        vals = v if isinstance(v, (list, tuple)) else [v]
+        pairs.append((k, list(vals)))
+    keys = [k for k, _ in pairs]
+    value_lists = [vals for _, vals in pairs]
+    for combo in product(*value_lists):
+        yield dict(zip(keys, combo))
 
 
 def expand_specs(series_spec):
@@ -187,18 +1971,12 @@ def expand_specs(series_spec):
     list[dict]
         One dict per combination, e.g.
         [{"Geography":"Quebec","Trade":"Import","NAPCS":"All merchandise"}, ...]
+        See `iter_specs` for the lazy variant.
     """
-    pairs = []
-    for dim in series_spec:
-        (k, v), = dim.items()
-        vals = v if isinstance(v, (list, tuple)) else [v]
-        pairs.append((k, list(vals)))
-    keys = [k for k, _ in pairs]
-    value_lists = [vals for _, vals in pairs]
-    return [dict(zip(keys, combo)) for combo in product(*value_lists)]
+    return list(iter_specs(series_spec))
 
 
-def getVectorIds(pid, coords):
+def getVectorIds(pid, coords, client=None):
     """
     Resolve coordinates to vector IDs (one vector == one time series).
 
@@ -206,8 +1984,11 @@ def getVectorIds(pid, coords):
     ----------
     pid : int or str
         productId of the table.
-    coords : list[str]
-        WDS coordinate strings (dot-joined memberIds).
+    coords : iterable of str
+        WDS coordinate strings (dot-joined memberIds); a lazy stream such as
+        `iterCoordinates` is consumed in chunks.
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
     Returns
     -------
@@ -219,27 +2000,12 @@ def getVectorIds(pid, coords):
     - If the cube/series combo is invalid, WDS may return vectorId=0; this function
       normalizes that to None for easier error handling upstream.
     """
-    # Translate coordinates to vectors via WDS
-    if len(coords) > 0:
-        vec_payload = [{"productId": pid, "coordinate": c} for c in coords]
-    else:
-        raise Exception("Invalid coordinates. Please specify all required dimensions")
-
-    series = requests.post(
-        f"{BASE}/getSeriesInfoFromCubePidCoord", json=vec_payload
-    ).json()
-
-    # Build {vectorId: title}; relies on WDS response structure
-    vec_map = { s["object"]["vectorId"]: s["object"]["SeriesTitleEn"] for s in series if s["object"]["vectorId"] != 0 }
+    return (client or get_default_client()).get_vector_ids(pid, coords)
 
-    # All-invalid case: a single item with vectorId 0 (common WDS pattern)
-    if not vec_map:
-        raise Exception(f"Failed to retrieve vectors for coordinates: {coords}. Please specify all required dimensions")
 
-    return vec_map
-
-
-def getTableData(pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31"):
+def getTableData(pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31", mode="auto",
+                 backend="pandas", layout="tidy", columns_from=None, index_from=None, fields=None,
+                 apply_scalar_factor=False, client=None):
     """
     Fetch data for multiple series over a reference-period range and return a tidy DataFrame.
 
@@ -259,66 +2025,216 @@ def getTableData(pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2
         Start of reference period range (YYYY-MM-DD).
     endRefPeriod : str
         End of reference period range (YYYY-MM-DD).
+    mode : {"auto", "vector", "bulk"}
+        - "vector": resolve coordinates and fetch each vector's datapoints (JSON).
+        - "bulk": download the cube's zipped full-table CSV once and filter it.
+        - "auto": "bulk" when the spec selects at least `client.bulk_threshold`
+          of the cube's series, else "vector".
+    backend : {"pandas", "arrow", "polars"}
+        Result type. "arrow" and "polars" build a `pyarrow.Table` / `polars.DataFrame`
+        directly from the fetched arrays (no intermediate pandas frame); they need
+        the optional pyarrow / polars packages, imported on first use.
+    layout : {"tidy", "wide"}
+        "wide" returns one row per (`index_from` labels, REF_DATE) and one value
+        column per series, scattered straight from the vector -> label mapping
+        (no long-to-wide pivot). Equivalent to `pivot_table(aggfunc="first")` on
+        the tidy frame, row and column order included.
+    columns_from : str or list[str]
+        With layout="wide": dimension(s) naming the value columns; several are
+        joined with " " (e.g. ["Trade", "Index"] -> "Import Price").
+    index_from : str or list[str] or None
+        With layout="wide": dimensions kept as row keys besides REF_DATE
+        (default: every selected dimension not in `columns_from`).
+    fields : str or list[str] or None
+        Datapoint attributes to add as columns after VALUE, among "releaseTime"
+        (RELEASE_TIME, datetime64), "symbolCode", "statusCode", "decimals" and
+        "scalarFactorCode" (SYMBOL_CODE, STATUS_CODE, DECIMALS,
+        SCALAR_FACTOR_CODE; nullable int8). Default: none.
+    apply_scalar_factor : bool
+        Multiply each VALUE by 10**scalarFactorCode (e.g. thousands -> units).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame or pyarrow.Table or polars.DataFrame
         Columns:
-          - one column per chosen dimension (as index columns)
-          - REF_DATE (reference period)
-          - VALUE (numeric observation)
+          - one column per chosen dimension (as index columns), Categorical
+            (dictionary-encoded with arrow/polars)
+          - REF_DATE (reference period), datetime64 (date32 / Date with arrow/polars)
+          - VALUE (numeric observation), float64
+          - the requested `fields`, if any
+        With layout="wide": the `index_from` columns, REF_DATE, then one float64
+        column per series, rows sorted by row key then date.
 
     Notes
     -----
     - This uses a multi-vector range endpoint with query parameters (vectorIds=...).
       Make sure the endpoint matches current WDS docs for multi-series range retrieval.
-    - Series titles from WDS are split on ';' and aligned to dimension columns ordered
-      by actual dimensionPositionId (via dim_map).
-    """
-    # 1) Expand cartesian product of user specs to per-series human dicts
-    expanded_specs = expand_specs(series_specs)
-
-    # 2) Build WDS coordinates for those dicts; also get {dimName: position}
-    coords, dim_map = buildCoordinates(pid, expanded_specs)
-
-    # 3) Resolve coordinates to vector IDs (+ readable titles)
-    vec_map = getVectorIds(pid, coords)
-
-    # 4) Fetch all vectors across the requested reference-period range
-    # Build a CSV of quoted vectorIds per current API style
-    vectorIds = ",".join([f'"{v}"' for v in vec_map.keys()])
-    series = requests.get(
-        f"{BASE}/getDataFromVectorByReferencePeriodRange"
-        f"?vectorIds={vectorIds}&startRefPeriod={startRefPeriod}&endReferencePeriod={endRefPeriod}"
-    ).json()
-
-    final_df = None
-
-    # 5) For each series payload, construct a small DataFrame and accumulate
-    for s in series:
-        vId = s["object"].get("vectorId")
-
-        # Determine the order of dimension columns:
-        # start from the user-specified dimension names...
-        index_cols = [list(spec.keys())[0] for spec in series_specs]
-        # ...then sort them by the cube's dimensionPositionId to match WDS title order
-        index_cols.sort(key=lambda col: dim_map.get(col, float("inf")))
-
-        # WDS series title encodes selected members separated by ';'
-        # We align those parts with our sorted dimension columns.
-        index_vals = vec_map[vId].split(";")
-        row_index = {k: v for k, v in zip(index_cols, index_vals) if k in dim_map.keys()}
-
-        # Extract datapoints for this vector into rows
-        dataPoints = s["object"].get("vectorDataPoint")
-        rows = []
-        for pt in dataPoints:
-            value = pt["value"]
-            ref_date = pt["refPer"]
-            row = row_index | {"REF_DATE": ref_date, "VALUE": value}
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
-        final_df = pd.concat([final_df, df], ignore_index=True)
-
-    return final_df
+    - Dimension labels come from each vector's coordinate memberIds, named through
+      the cube schema; columns are ordered by dimensionPositionId.
+    """
+    return (client or get_default_client()).get_table_data(
+        pid, series_specs, startRefPeriod=startRefPeriod, endRefPeriod=endRefPeriod, mode=mode, backend=backend,
+        layout=layout, columns_from=columns_from, index_from=index_from, fields=fields,
+        apply_scalar_factor=apply_scalar_factor,
+    )
+
+
+def iterTableData(pid, series_specs, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                  ordered=False, backend="pandas", fields=None, apply_scalar_factor=False, client=None):
+    """
+    Stream the data of `getTableData` as a sequence of bounded tidy DataFrames.
+
+    Parameters
+    ----------
+    pid : int or str
+        productId of the table.
+    series_specs : list[dict]
+        Compact specification used by `expand_specs` (same as `getTableData`).
+    startRefPeriod : str
+        Start of reference period range (YYYY-MM-DD).
+    endRefPeriod : str
+        End of reference period range (YYYY-MM-DD).
+    ordered : bool
+        If True, yield frames in shard order (vector group, then period window)
+        rather than as soon as each shard arrives.
+    backend : {"pandas", "arrow", "polars"}
+        Type of the yielded frames (see `getTableData`).
+    fields, apply_scalar_factor
+        Optional datapoint attributes and value scaling (see `getTableData`).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+
+    Returns
+    -------
+    TableDataStream
+        Iterable of DataFrames with the same columns as `getTableData`, one per
+        retrieval shard. Its `labels` attribute (vectorId -> dimension labels) is
+        available before iteration starts.
+
+    Examples
+    --------
+    >>> stream = iterTableData(18100006, spec)
+    >>> stream.labels.head()
+    >>> for frame in stream:
+    ...     load_chunk(frame)
+    """
+    return (client or get_default_client()).iter_table_data(
+        pid, series_specs, startRefPeriod=startRefPeriod, endRefPeriod=endRefPeriod, ordered=ordered,
+        backend=backend, fields=fields, apply_scalar_factor=apply_scalar_factor,
+    )
+
+
+def getChangedTableData(pid, series_specs, since, startRefPeriod="2000-01-01", endRefPeriod="2025-12-31",
+                        fields=None, apply_scalar_factor=False, client=None):
+    """
+    Fetch only the datapoints published since a watermark (delta refresh).
+
+    Parameters
+    ----------
+    pid : int or str
+        productId of the table.
+    series_specs : list[dict]
+        Compact specification used by `expand_specs` (same as `getTableData`).
+    since : datetime or str
+        Watermark, e.g. the start time of the last successful run. Naive values
+        are taken as Eastern time (the WDS clock); aware values are converted.
+    startRefPeriod, endRefPeriod : str
+        Reference-period range of interest (YYYY-MM-DD); changed points outside
+        it are dropped.
+    fields, apply_scalar_factor
+        Optional datapoint attributes and value scaling (see `getTableData`);
+        "releaseTime" tells which release each revision came from.
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns as `getTableData`, holding only new or revised points. Empty
+        when the cube was not republished since `since`.
+
+    Notes
+    -----
+    - Whether the cube changed is answered from `getChangedCubeList` (one call per
+      day since the watermark, cached on disk), so a quiet cube costs no data
+      requests at all. A watermark more than a week old is not walked: the
+      points released since it are pulled as after several releases.
+    - If the cube was released once since the watermark, only the changed points
+      are pulled via `getChangedSeriesDataFromVector`. After several releases that
+      endpoint no longer covers them all, so everything released since the
+      watermark is pulled with `getBulkVectorDataByRange` instead.
+    """
+    return (client or get_default_client()).get_changed_table_data(
+        pid, series_specs, since, startRefPeriod=startRefPeriod, endRefPeriod=endRefPeriod, fields=fields,
+        apply_scalar_factor=apply_scalar_factor,
+    )
+
+
+def getBulkVectorDataByRange(vectorIds, startReleaseTime, endReleaseTime=None, fields=None,
+                             apply_scalar_factor=False, client=None):
+    """
+    Fetch the datapoints of a set of vectors released between two timestamps.
+
+    Parameters
+    ----------
+    vectorIds : iterable of int
+        Vectors to query.
+    startReleaseTime : datetime or str
+        Start of the release window (e.g. the last successful run). Naive values
+        are taken as Eastern time (the WDS clock); aware values are converted.
+    endReleaseTime : datetime or str or None
+        End of the release window; defaults to now.
+    fields, apply_scalar_factor
+        Optional datapoint attributes and value scaling (see `getTableData`).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns VECTOR_ID, REF_DATE, VALUE (+ `fields`); one row per datapoint
+        released in the window, whether it is a new reference period or a
+        revision of an old one.
+    """
+    fields = check_fields(fields)
+    series = (client or get_default_client()).get_vector_data_by_release(
+        vectorIds, startReleaseTime, endReleaseTime
+    )
+    df = _assemble_frame(series, LabelTable.from_dict({v: {"VECTOR_ID": v} for v in series}, ["VECTOR_ID"]),
+                         fields=fields, apply_scalar_factor=apply_scalar_factor)
+    df["VECTOR_ID"] = df["VECTOR_ID"].astype(np.int64)
+    return df
+
+
+def getReleasedTableData(pid, series_specs, startReleaseTime, endReleaseTime=None, fields=None,
+                         apply_scalar_factor=False, client=None):
+    """
+    Fetch the datapoints of a spec released between two timestamps.
+
+    Same as `getBulkVectorDataByRange`, but for a compact spec: coordinates are
+    resolved as in `getTableData` and the result carries the dimension labels.
+
+    Parameters
+    ----------
+    pid : int or str
+        productId of the table.
+    series_specs : list[dict]
+        Compact specification used by `expand_specs` (same as `getTableData`).
+    startReleaseTime, endReleaseTime : datetime or str
+        Release window (see `getBulkVectorDataByRange`); `endReleaseTime`
+        defaults to now.
+    fields, apply_scalar_factor
+        Optional datapoint attributes and value scaling (see `getTableData`).
+    client : WDSClient or None
+        Client to use; defaults to `get_default_client()`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns as `getTableData`, holding only points released in the window.
+    """
+    return (client or get_default_client()).get_released_table_data(
+        pid, series_specs, startReleaseTime, endReleaseTime, fields=fields, apply_scalar_factor=apply_scalar_factor
+    )
@@ -0,0 +1,86 @@
+"""
+Optional datapoint attributes for `getTableData(fields=...)`.
+
+Besides `refPer` and `value`, every WDS datapoint carries its release time, a
+symbol and status code, the number of decimals to display and the scalar factor
+of the value. They are only kept when asked for, and then stored compactly:
+
+- code attributes (`symbolCode`, `statusCode`, `decimals`, `scalarFactorCode`):
+  `int8` columns, nullable (pandas `Int8`, nulls with arrow/polars);
+- `releaseTime`: `datetime64[ms]`, parsed once per distinct release.
+
+`scale_values` applies scalar factor codes to the values in one vectorized
+multiply (code k means units of 10**k).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# WDS datapoint attribute -> output column
+FIELDS = {
+    "releaseTime": "RELEASE_TIME",
+    "symbolCode": "SYMBOL_CODE",
+    "statusCode": "STATUS_CODE",
+    "decimals": "DECIMALS",
+    "scalarFactorCode": "SCALAR_FACTOR_CODE",
+}
+
+# Attributes the full-table CSV carries (bulk mode), with their CSV column
+BULK_FIELDS = {
+    "decimals": "DECIMALS",
+    "scalarFactorCode": "SCALAR_ID",
+}
+
+
+def check_fields(fields):
+    """Normalize a `fields=` argument to a tuple of attribute names, rejecting unknown ones."""
+    if fields is None:
+        return ()
+    fields = (fields,) if isinstance(fields, str) else tuple(dict.fromkeys(fields))
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {unknown}; expected some of {list(FIELDS)}")
+    return fields
+
+
+def fetched_fields(fields, apply_scalar_factor):
+    """Attributes to extract: `fields`, plus `scalarFactorCode` when values are scaled."""
+    if apply_scalar_factor and "scalarFactorCode" not in fields:
+        return fields + ("scalarFactorCode",)
+    return fields
+
+
+def field_array(field, raw):
+    """
+    Compact form of one attribute's raw values.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray or None)
+        The values (`int8` codes, or `datetime64[ms]` for releaseTime with NaT
+        when missing) and a boolean mask of missing codes (None if none are).
+    """
+    if field == "releaseTime":
+        codes, uniques = pd.factorize(np.asarray(raw, dtype=object))
+        stamps = pd.to_datetime(uniques).to_numpy().astype("datetime64[ms]")
+        # A trailing NaT is what code -1 (missing) picks
+        return np.append(stamps, np.datetime64("NaT", "ms")).take(codes), None
+    values = np.asarray(raw, dtype=object).astype(np.float64)  # None -> NaN
+    missing = np.isnan(values)
+    return np.where(missing, 0, values).astype(np.int8), (missing if missing.any() else None)
+
+
+def scale_values(values, factor_codes):
+    """Multiply `values` by 10**code per row; missing codes (`field_array` mask) leave a value as is."""
+    codes, missing = factor_codes
+    exponents = codes if missing is None else np.where(missing, 0, codes)
+    return values * np.power(10.0, exponents)
+
+
+def to_pandas(column):
+    """pandas array for a `field_array` result (nullable `Int8` for codes)."""
+    values, missing = column
+    if values.dtype.kind == "M":
+        return values
+    return pd.arrays.IntegerArray(values, missing if missing is not None else np.zeros(len(values), dtype=bool))
@@ -0,0 +1,106 @@
+"""
+Instrumentation events for `WDSClient`.
+
+A client created with `on_event=callback` (or given one later, see
+`instrument`) calls `callback(event)` with an `Event` at every step worth
+measuring. With no callback, a hook site costs an `is None` check (phases, a
+no-op context manager) and no event is built.
+
+Event kinds:
+
+- "phase": wall time of one step of a call, in `seconds`. Names:
+  "metadata" (fetching a cube schema), "resolve" (spec -> vector IDs and
+  labels), "download" (all data requests of a call, concurrent shards
+  included; one per shard with `iterTableData`), "decode" (JSON decoding of
+  one response body), "bulk_parse" (filtering a full-table CSV) and
+  "assemble" (building the result frame).
+- "request": one HTTP response read to the end; `name` is the endpoint,
+  `seconds` runs from sending the request to the decoded body (rate-limiter
+  waits excluded, decoding included), with `wire_bytes` / `decoded_bytes`
+  as in `Transfer`.
+- "throttled": one HTTP 429/503 answer (the request is retried).
+- "cache_hit" / "cache_miss": `count` lookups answered from, or missing in,
+  one of the caches: "schema" (in-process memo), "metadata", "changed_cubes",
+  "vectors" (coordinate resolutions) and "bulk" (full-table zips).
+
+Decode time is the time spent reading a body minus the time spent waiting for
+its chunks, so it is measured the same way whether the body is joined and
+decoded at once or parsed incrementally while it streams in. Request names
+drop path arguments (`getChangedCubeList/2024-05-01` is "getChangedCubeList");
+the full-table zip download is reported as "fullTableZip". Events may arrive
+from worker threads.
+
+`Metrics` is a ready-made callback that aggregates events.
+"""
+
+import threading
+from collections import namedtuple
+
+
+Event = namedtuple(
+    "Event", ["kind", "name", "pid", "seconds", "count", "wire_bytes", "decoded_bytes"],
+    defaults=(None, 0.0, 1, 0, 0),
+)
+
+
+class Metrics:
+    """
+    Thread-safe aggregate of `Event`s; pass an instance as `on_event`.
+
+    Examples
+    --------
+    >>> metrics = Metrics()
+    >>> client = WDSClient(on_event=metrics)
+    >>> df = client.get_table_data(18100006, specs)
+    >>> metrics.summary()["phases"]["download"]["seconds"]
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._phases = {}  # {name: [calls, seconds]}
+            self._requests = {}  # {endpoint: [count, seconds, wire_bytes, decoded_bytes, throttled]}
+            self._caches = {}  # {name: [hits, misses]}
+
+    def __call__(self, event):
+        kind = event.kind
+        with self._lock:
+            if kind == "phase":
+                phase = self._phases.setdefault(event.name, [0, 0.0])
+                phase[0] += 1
+                phase[1] += event.seconds
+            elif kind == "request":
+                request = self._requests.setdefault(event.name, [0, 0.0, 0, 0, 0])
+                request[0] += event.count
+                request[1] += event.seconds
+                request[2] += event.wire_bytes
+                request[3] += event.decoded_bytes
+            elif kind == "throttled":
+                self._requests.setdefault(event.name, [0, 0.0, 0, 0, 0])[4] += event.count
+            elif kind in ("cache_hit", "cache_miss"):
+                self._caches.setdefault(event.name, [0, 0])[kind == "cache_miss"] += event.count
+
+    def summary(self):
+        """
+        Totals recorded so far.
+
+        Returns
+        -------
+        dict
+            phases: {name: {calls, seconds}};
+            requests: {count, seconds, wire_bytes, decoded_bytes, throttled,
+            by_endpoint: {endpoint: same keys}};
+            caches: {name: {hits, misses}}.
+        """
+        keys = ("count", "seconds", "wire_bytes", "decoded_bytes", "throttled")
+        with self._lock:
+            phases = {name: {"calls": c, "seconds": s} for name, (c, s) in self._phases.items()}
+            by_endpoint = {name: dict(zip(keys, r)) for name, r in self._requests.items()}
+            caches = {name: {"hits": h, "misses": m} for name, (h, m) in self._caches.items()}
+        requests = {k: sum(r[k] for r in by_endpoint.values()) for k in keys}
+        requests["by_endpoint"] = by_endpoint
+        return {"phases": phases, "requests": requests, "caches": caches}
@@ -0,0 +1,149 @@
+"""
+JSON decoding for WDS responses.
+
+Data responses (`vectorDataPoint` lists) run to several megabytes, and decoding
+them with the stdlib dominated retrieval time once the network was pooled. The
+decoder used here is pluggable:
+
+- `loads` is `orjson.loads` when orjson is installed (`pip install
+  "statcan_wds[fast]"`) and `json.loads` otherwise; `JSON_BACKEND` names which.
+- Clients accept a `json_loads=` callable (bytes -> object) to override it.
+
+Responses are read as a stream of decompressed chunks (clients always negotiate
+gzip/deflate). `read_json` either joins the chunks and decodes them with `loads`,
+or, when incremental decoding is requested (needs ijson), parses them as they
+arrive so the raw body is never buffered whole. `Transfer` records how many bytes
+came over the wire versus how many were decoded, per call.
+
+`point_columns` pulls `refPer` / `value` out of decoded datapoints straight into
+flat lists with C-level `itemgetter` maps, so frame assembly never loops over the
+points in Python; `point_fields` does the same for optional attributes.
+"""
+
+import json
+import sys
+from collections import namedtuple
+from operator import itemgetter, methodcaller
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, for incremental decoding
+    ijson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    loads = json.loads
+    JSON_BACKEND = "json"
+
+# Request header sent by every client
+ACCEPT_ENCODING = "gzip, deflate"
+
+# Decompressed bytes handed to the decoder per read
+CHUNK_SIZE = 1 << 16
+
+
+# One response: endpoint (without query string), compressed bytes received,
+# decompressed bytes decoded, and the Content-Encoding the server applied.
+Transfer = namedtuple("Transfer", ["endpoint", "wire_bytes", "decoded_bytes", "encoding"])
+
+
+_ref_per = itemgetter("refPer")
+_value = itemgetter("value")
+
+
+def point_columns(points):
+    """Return ([refPer, ...], [value, ...]) for a list of decoded WDS datapoints."""
+    return list(map(_ref_per, points)), list(map(_value, points))
+
+
+def point_fields(points, fields):
+    """Return [[point[field], ...] for field in fields] (None where a point lacks the key)."""
+    columns = []
+    for field in fields:
+        try:
+            columns.append(list(map(itemgetter(field), points)))
+        except KeyError:  # rare; `.get` is ~4x slower than `itemgetter`
+            columns.append(list(map(methodcaller("get", field), points)))
+    return columns
+
+
+class _InternedDict(dict):
+    """dict whose keys are interned, so the thousands of datapoint objects share their key strings."""
+
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, sys.intern(key), value)
+
+
+def iter_json(reader):
+    """ijson parse of the top-level value of `reader` (sync or async `read(n)`)."""
+    # orjson caches repeated keys; without interning, ijson's tree is ~2x larger
+    return ijson.items(reader, "", use_float=True, map_type=_InternedDict)
+
+
+def incomplete_json(reader):
+    """ValueError for a body the incremental parser found no complete JSON value in."""
+    return ValueError(f"Response body is not a complete JSON document ({reader.bytes_read} bytes read)")
+
+
+class _ChunkReader:
+    """Minimal file-like view (`read(n)`) over an iterator of byte chunks, counting bytes."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._chunks)
+            self._buffer = b""
+        else:
+            while len(self._buffer) < size:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.bytes_read += len(data)
+        return data
+
+
+def read_json(chunks, json_loads=None, incremental=False):
+    """
+    Decode a JSON document delivered as an iterator of (decompressed) byte chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes
+        Response body, already decompressed.
+    json_loads : callable or None
+        Decoder for the joined body; defaults to `loads`.
+    incremental : bool
+        Parse the chunks with ijson as they arrive instead of joining them first.
+        Requires ijson; numbers come back as floats, like the stdlib decoder.
+
+    Returns
+    -------
+    (object, int)
+        The decoded document and the number of body bytes decoded.
+    """
+    reader = _ChunkReader(chunks)
+    if incremental:
+        # Prefix "" is the top-level value, built as the parser goes
+        try:
+            doc = next(iter_json(reader))
+        except (StopIteration, ijson.JSONError) as exc:
+            raise incomplete_json(reader) from exc
+    else:
+        doc = (json_loads or loads)(reader.read())
+    return doc, reader.bytes_read
@@ -0,0 +1,194 @@
+"""
+Client-side throttling shared by `WDSClient` and `AsyncWDSClient`.
+
+- `RateLimiter`: token bucket capping the sustained request rate (requests/second)
+  while allowing short bursts.
+- `AdaptiveConcurrency`: AIMD limit on requests in flight. It halves on HTTP
+  429/503 and grows back by one slot after a full window of successes.
+  `AsyncAdaptiveConcurrency` is the same limit for coroutines on one event loop.
+- `backoff_delay`: jittered exponential delay used between retries of throttled
+  requests, honouring `Retry-After` when the server sends one.
+
+All state is guarded by a lock, so one instance can be shared by every worker
+thread of a client (or, for the async variant, every task of a client).
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+
+# HTTP statuses that mean "slow down" rather than "this request is wrong"
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Parameters
+    ----------
+    rate : float or None
+        Sustained requests per second. None disables rate limiting.
+    burst : int or None
+        Bucket capacity (requests allowed back-to-back); defaults to `rate`.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst if burst is not None else (rate or 1)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token and return how long (seconds) the caller must wait before
+        sending. Tokens may go negative: later callers queue up behind earlier ones.
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until the caller may send one request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight requests.
+
+    Parameters
+    ----------
+    initial : int
+        Starting limit.
+    minimum, maximum : int
+        Bounds of the limit.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum if maximum is not None else initial)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def try_acquire(self):
+        """Take a slot if one is free; return whether it was taken."""
+        with self._cond:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a slot is free, then take it."""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        """Give a slot back."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        """Grow the limit by one after `limit` consecutive successes."""
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify()
+
+    def on_throttle(self):
+        """Halve the limit after the server pushed back."""
+        with self._cond:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+
+class AsyncAdaptiveConcurrency(AdaptiveConcurrency):
+    """
+    `AdaptiveConcurrency` for tasks on one asyncio event loop.
+
+    Slots are awaited on an `asyncio.Condition`, so a waiting task yields to the
+    loop instead of blocking it. Every method except `try_acquire` is a coroutine.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None):
+        super().__init__(initial, minimum, maximum)
+        self._cond = None  # see _condition
+
+    def _condition(self):
+        # Created on first use, inside the running loop: before Python 3.10 an
+        # asyncio.Condition binds to get_event_loop() when it is constructed
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def try_acquire(self):
+        """Take a slot if one is free; return whether it was taken."""
+        if self.in_flight < self.limit:  # no await in between, so no lock needed
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self):
+        """Wait until a slot is free, then take it."""
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self):
+        """Give a slot back."""
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            cond.notify()
+
+    async def on_success(self):
+        """Grow the limit by one after `limit` consecutive successes."""
+        cond = self._condition()
+        async with cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                cond.notify()
+
+    async def on_throttle(self):
+        """Halve the limit after the server pushed back."""
+        async with self._condition():
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0, retry_after=None):
+    """
+    Delay before retry number `attempt` (0-based).
+
+    Uses "full jitter": a uniform draw in [0, min(cap, base * 2**attempt)], so
+    concurrent workers that were throttled together don't retry in lockstep. A
+    numeric `Retry-After` header value, when given, is used as a floor.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    try:
+        if retry_after is not None:
+            delay = max(delay, min(cap, float(retry_after)))
+    except ValueError:
+        pass  # HTTP-date form of Retry-After; keep the jittered delay
+    return delay